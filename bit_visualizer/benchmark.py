@@ -0,0 +1,299 @@
+"""
+Benchmarks for the core BIT engines
+Usage: python benchmark.py <name> [<name> ...]
+"""
+import bisect
+import math
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from array import array
+
+from src.core import (FenwickTree, ConcurrentFenwickTree, FloatFenwickTree,
+                      SegmentTree, SqrtDecomposition, FenwickMultiset, BlockedFenwickTree,
+                      ShardedFenwickTree, calculate_bit_array, calculate_bit_array_parallel)
+
+# Engines sharing the update/prefix/range_sum interface
+ENGINES = {
+    'fenwick': FenwickTree,
+    'segment': SegmentTree,
+    'sqrt': SqrtDecomposition
+}
+
+
+def _report(title, rows):
+    """Print rows of (label, value) under a title"""
+    print(title)
+    for label, value in rows:
+        print(f"  {label:<32} {value}")
+
+
+def bench_concurrent(n=100_000, operations=200_000, write_ratio=0.2):
+    """Throughput of the concurrent wrapper against the unlocked engine"""
+    rng = random.Random(0)
+    ops = [(rng.random() < write_ratio, rng.randint(1, n)) for _ in range(operations)]
+
+    def run(tree, threads):
+        chunk = len(ops) // threads
+
+        def worker(part):
+            for is_write, index in part:
+                if is_write:
+                    tree.update(index, 1)
+                else:
+                    tree.prefix(index)
+
+        workers = [threading.Thread(target=worker, args=(ops[i * chunk:(i + 1) * chunk],))
+                   for i in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return chunk * threads / (time.perf_counter() - start)
+
+    rows = [('unlocked, threads=1', f"{run(FenwickTree([0] * n), 1):,.0f} ops/s")]
+    for mode in ConcurrentFenwickTree.MODES:
+        for threads in (1, 4, 16):
+            tree = ConcurrentFenwickTree(FenwickTree([0] * n), mode=mode)
+            rows.append((f"{mode}, threads={threads}", f"{run(tree, threads):,.0f} ops/s"))
+    _report(f"Concurrent throughput (n={n}, {write_ratio:.0%} writes)", rows)
+
+
+def bench_float(n=100_000, queries=2_000):
+    """Accuracy and throughput of compensated against naive float prefix sums"""
+    rng = random.Random(0)
+    # Mixed magnitudes make naive summation drift
+    values = [rng.uniform(-1, 1) * 10 ** rng.randint(-6, 8) for _ in range(n)]
+    indices = [rng.randint(1, n) for _ in range(queries)]
+    exact = {i: math.fsum(values[:i]) for i in set(indices)}
+
+    rows = []
+    for name, build in (('naive', lambda: FenwickTree(values)),
+                        ('compensated', lambda: FloatFenwickTree(values))):
+        start = time.perf_counter()
+        tree = build()
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [tree.prefix(i) for i in indices]
+        query_time = time.perf_counter() - start
+
+        error = max(abs(result - exact[i]) for result, i in zip(results, indices))
+        rows.append((f"{name} build", f"{build_time * 1000:.1f} ms"))
+        rows.append((f"{name} query", f"{queries / query_time:,.0f} queries/s"))
+        rows.append((f"{name} max abs error", f"{error:.3e}"))
+
+    start = time.perf_counter()
+    for i in indices[:200]:
+        math.fsum(values[:i])
+    rows.append(('math.fsum over raw prefix', f"{200 / (time.perf_counter() - start):,.0f} queries/s"))
+    _report(f"Float prefix sums (n={n})", rows)
+
+
+def bench_engines(sizes=(1_000, 10_000, 100_000), operations=20_000, read_ratios=(0.9, 0.5, 0.1)):
+    """Build, update, query, memory and mixed-workload cost of each engine"""
+    rng = random.Random(0)
+    for n in sizes:
+        values = [rng.randint(-1000, 1000) for _ in range(n)]
+        indices = [rng.randint(1, n) for _ in range(operations)]
+        rows = []
+
+        for name, engine in ENGINES.items():
+            # Memory is traced on a separate build since tracing slows allocation
+            tracemalloc.start()
+            engine(values)
+            memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            tree = engine(values)
+            build_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for index in indices:
+                tree.update(index, 1)
+            update_rate = operations / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for index in indices:
+                tree.prefix(index)
+            query_rate = operations / (time.perf_counter() - start)
+
+            rows.append((f"{name} build", f"{build_time * 1000:.1f} ms, {memory / 1024:,.0f} KiB"))
+            rows.append((f"{name} update", f"{update_rate:,.0f} ops/s"))
+            rows.append((f"{name} prefix", f"{query_rate:,.0f} ops/s"))
+
+            for read_ratio in read_ratios:
+                reads = [rng.random() < read_ratio for _ in indices]
+                start = time.perf_counter()
+                for is_read, index in zip(reads, indices):
+                    if is_read:
+                        tree.prefix(index)
+                    else:
+                        tree.update(index, 1)
+                rate = operations / (time.perf_counter() - start)
+                rows.append((f"{name} {read_ratio:.0%} reads", f"{rate:,.0f} ops/s"))
+
+        _report(f"Engines (n={n})", rows)
+
+
+def bench_multiset(max_key=1_000_000, sizes=(10_000, 100_000), queries=10_000):
+    """Order-statistics multiset against bisect.insort on a sorted list"""
+    rng = random.Random(0)
+    for size in sizes:
+        keys = [rng.randint(0, max_key) for _ in range(size)]
+        ks = [rng.randint(1, size) for _ in range(queries)]
+        probes = [rng.randint(0, max_key) for _ in range(queries)]
+        rows = []
+
+        # Trees are allocated outside the timed sections
+        multiset = FenwickMultiset(max_key)
+        batched = FenwickMultiset(max_key)
+        compressed = FenwickMultiset(keys=keys)
+
+        start = time.perf_counter()
+        for key in keys:
+            multiset.insert(key)
+        rows.append(('fenwick insert', f"{size / (time.perf_counter() - start):,.0f} ops/s"))
+
+        start = time.perf_counter()
+        batched.insert_many(keys)
+        rows.append(('fenwick insert_many', f"{size / (time.perf_counter() - start):,.0f} ops/s"))
+
+        start = time.perf_counter()
+        compressed.insert_many(keys)
+        rows.append(('compressed insert_many', f"{size / (time.perf_counter() - start):,.0f} ops/s"))
+
+        start = time.perf_counter()
+        for k in ks:
+            multiset.kth(k)
+        rows.append(('fenwick kth', f"{queries / (time.perf_counter() - start):,.0f} ops/s"))
+
+        start = time.perf_counter()
+        for probe in probes:
+            multiset.count_less(probe)
+        rows.append(('fenwick count_less', f"{queries / (time.perf_counter() - start):,.0f} ops/s"))
+
+        start = time.perf_counter()
+        sorted_keys = []
+        for key in keys:
+            bisect.insort(sorted_keys, key)
+        rows.append(('insort insert', f"{size / (time.perf_counter() - start):,.0f} ops/s"))
+
+        start = time.perf_counter()
+        for k in ks:
+            sorted_keys[k - 1]
+        rows.append(('sorted list kth', f"{queries / (time.perf_counter() - start):,.0f} ops/s"))
+
+        start = time.perf_counter()
+        for probe in probes:
+            bisect.bisect_left(sorted_keys, probe)
+        rows.append(('sorted list count_less', f"{queries / (time.perf_counter() - start):,.0f} ops/s"))
+
+        _report(f"Multiset (max_key={max_key}, size={size})", rows)
+
+
+def bench_blocked(sizes=(100_000, 1_000_000, 4_000_000), operations=50_000, block_sizes=(16, 64, 256)):
+    """Blocked prefix layout against the classic calculate_bit_array layout"""
+    rng = random.Random(0)
+    for n in sizes:
+        values = [rng.randint(-1000, 1000) for _ in range(n)]
+        indices = [rng.randint(1, n) for _ in range(operations)]
+        engines = [('classic', lambda: FenwickTree(values))]
+        engines += [(f"blocked B={size}", lambda size=size: BlockedFenwickTree(values, size))
+                    for size in block_sizes]
+        rows = []
+
+        for name, build in engines:
+            start = time.perf_counter()
+            tree = build()
+            build_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for index in indices:
+                tree.prefix(index)
+            query_rate = operations / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for index in indices:
+                tree.update(index, 1)
+            update_rate = operations / (time.perf_counter() - start)
+
+            rows.append((f"{name} build", f"{build_time * 1000:.1f} ms"))
+            rows.append((f"{name} prefix", f"{query_rate:,.0f} ops/s"))
+            rows.append((f"{name} update", f"{update_rate:,.0f} ops/s"))
+            del tree
+
+        _report(f"Blocked layout (n={n})", rows)
+
+
+def bench_sharded(n=1_000_000, batch=200_000, worker_counts=(1, 2, 4, 8)):
+    """Batched update and prefix throughput of the sharded engine by worker count"""
+    rng = random.Random(0)
+    values = [rng.randint(-1000, 1000) for _ in range(n)]
+    indices = [rng.randint(1, n) for _ in range(batch)]
+    deltas = [rng.randint(-10, 10) for _ in range(batch)]
+    rows = []
+
+    tree = FenwickTree(values)
+    start = time.perf_counter()
+    tree.apply_updates(indices, deltas)
+    rows.append(('single process updates', f"{batch / (time.perf_counter() - start):,.0f} ops/s"))
+    start = time.perf_counter()
+    for index in indices:
+        tree.prefix(index)
+    rows.append(('single process prefix', f"{batch / (time.perf_counter() - start):,.0f} ops/s"))
+
+    for workers in worker_counts:
+        with ShardedFenwickTree(values, workers=workers) as sharded:
+            start = time.perf_counter()
+            sharded.apply_updates(indices, deltas)
+            rows.append((f"{workers} shards updates", f"{batch / (time.perf_counter() - start):,.0f} ops/s"))
+            start = time.perf_counter()
+            sharded.prefix_many(indices)
+            rows.append((f"{workers} shards prefix", f"{batch / (time.perf_counter() - start):,.0f} ops/s"))
+
+    _report(f"Sharded engine (n={n}, batch={batch}, {os.cpu_count()} cores)", rows)
+
+
+def bench_parallel(n=10_000_000, worker_counts=(1, 2, 4, 8, 16)):
+    """Parallel block build against calculate_bit_array, by worker count"""
+    rng = random.Random(0)
+    values = array('q', (rng.randint(-1000, 1000) for _ in range(n)))
+    rows = []
+
+    start = time.perf_counter()
+    calculate_bit_array(values)
+    baseline = time.perf_counter() - start
+    rows.append(('calculate_bit_array', f"{baseline:.2f} s"))
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        calculate_bit_array_parallel(values, workers=workers)
+        elapsed = time.perf_counter() - start
+        rows.append((f"{workers} workers", f"{elapsed:.2f} s, {baseline / elapsed:.1f}x"))
+
+    _report(f"Parallel build (n={n}, {os.cpu_count()} cores)", rows)
+
+
+BENCHMARKS = {
+    'concurrent': bench_concurrent,
+    'float': bench_float,
+    'engines': bench_engines,
+    'multiset': bench_multiset,
+    'blocked': bench_blocked,
+    'sharded': bench_sharded,
+    'parallel': bench_parallel
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            sys.exit(f"Unknown benchmark: {name}. Available: {', '.join(BENCHMARKS)}")
+        BENCHMARKS[name]()
@@ -5,9 +5,13 @@ import threading
 
 from ..utils.geometry import calculate_positions, calculate_root_position, calculate_arrow_intersection, calculate_visual_properties
 from ..utils.constants import (NODE_RADIUS, NODE_COLOR, DEFAULT_FONT, DEFAULT_FONT_SIZE,
-                             ANIMATION_STEPS, LEFT_MARGIN, TOP_MARGIN, X_SPACING)
-from ..core.bit_operations import calculate_bit_array, calculate_levels
+                             ANIMATION_STEPS, LEFT_MARGIN, TOP_MARGIN, X_SPACING,
+                             QUERY_NODE_COLOR, QUERY_SUBTRACT_COLOR, QUERY_MIRROR_COLOR)
+from ..core.bit_operations import calculate_bit_array, calculate_levels, prefix_query_nodes
+from ..core.minmax_fenwick import range_query_nodes
 from ..core.animation import prepare_animation_steps
+from ..core.operations import SUM, MIN, MAX
+from ..core.fenwick import FenwickTree
 from ..core.file_operations import save_state, load_state
 from ..gui.controls import ControlPanel
 
@@ -31,6 +35,10 @@ class BITVisualizer:
         self.arrows = {}
         self.bit_array = []
         self.initial_array = []
+        self.operation = SUM
+        self.query_range = None
+        self.bit_cells = {}
+        self.initial_cells = {}
 
         # Create control panel with callbacks
         callbacks = {
@@ -39,12 +47,14 @@ class BITVisualizer:
             'load_from_file': self.load_from_file,
             'save_to_file': self.save_to_file,
             'initialize_bit': self.initialize_bit,
+            'append_values': self.append_values,
             'mode_changed': self.mode_changed,
             'start_animation': self.start_animation,
             'stop_animation': self.stop_animation,
             'prev_step': self.prev_step,
             'next_step': self.next_step,
-            'scale_changed': self.scale_changed
+            'scale_changed': self.scale_changed,
+            'show_query': self.show_query
         }
         self.control_panel = ControlPanel(parent, callbacks)
 
@@ -284,7 +294,9 @@ class BITVisualizer:
 
         try:
             self.initial_array = list(map(int, self.control_panel.input_entry.get().split(',')))
-            self.bit_array = calculate_bit_array(self.initial_array)
+            self.operation = self.control_panel.get_operation()
+            self.bit_array = calculate_bit_array(self.initial_array, self.operation)
+            self.query_range = None
             self.current_step = current_step
             self.initialized = True
 
@@ -298,6 +310,64 @@ class BITVisualizer:
         except ValueError:
             messagebox.showerror("Error", "Please enter valid comma-separated numbers")
 
+    def append_values(self):
+        """Grow the tree with values appended to the input, animating only the new nodes"""
+        if self.animation_running or self.step_in_progress:
+            return
+
+        try:
+            values = list(map(int, self.control_panel.input_entry.get().split(',')))
+        except ValueError:
+            messagebox.showerror("Error", "Please enter valid comma-separated numbers")
+            return
+
+        old_n = len(self.initial_array)
+        if (not self.initialized or len(values) <= old_n or values[:old_n] != self.initial_array
+                or self.control_panel.get_operation() != self.operation):
+            messagebox.showerror("Error", "Append expects the current array followed by new values")
+            return
+
+        # The root step connects every parentless node, so it is replayed after the new nodes
+        root_drawn = self.current_step == len(self.animation_steps) and self.current_step > old_n
+
+        # Node positions depend on the highest RSB level; when it grows the whole tree moves
+        if max(calculate_levels(len(values))) != max(calculate_levels(old_n)):
+            self.initialize_bit(old_n if root_drawn else self.current_step)
+            if self.control_panel.get_mode() == "automatic" and root_drawn:
+                self.start_animation()
+            return
+
+        tree = FenwickTree(self.initial_array, self.operation, typed=False)
+        tree.extend(values[old_n:])
+
+        self.initial_array = values
+        self.bit_array = tree.bit_array
+        self.animation_steps = prepare_animation_steps(
+            values, self.bit_array, calculate_levels(len(values)))
+
+        if root_drawn:
+            self._remove_root()
+            self.current_step = old_n
+
+        scale = self.control_panel.get_scale_value() * self.application.scale_factor
+        line_width = calculate_visual_properties(scale)['rect_line_width']
+        for i in range(old_n, len(values)):
+            self._draw_array_column(i, scale, line_width)
+
+        self.highlight_query()
+        self.update_controls()
+        if self.control_panel.get_mode() == "automatic" and root_drawn:
+            self.start_animation()
+
+    def _remove_root(self):
+        """Delete the drawn root node and its connections without animation"""
+        for key in [key for key in self.arrows if key.startswith('root-')]:
+            self.canvas.delete(self.arrows.pop(key))
+        if hasattr(self, 'root_node'):
+            for item in self.root_node:
+                self.canvas.delete(item)
+            del self.root_node
+
     def draw_initial_state(self):
         """Draw static elements of visualization"""
         self.canvas.delete('all')
@@ -314,24 +384,37 @@ class BITVisualizer:
 
     def draw_arrays(self, scale, line_width):
         """Draw initial and BIT arrays"""
-        x_spacing = X_SPACING * scale
         left_margin = LEFT_MARGIN * scale
         array_y = self._calculate_array_y_position(scale)
-        box_size = NODE_RADIUS * scale
+
+        # Label the BIT row with the operation its nodes combine with
+        self.canvas.create_text(
+            left_margin, array_y + 30 * scale,
+            text=self.operation.name,
+            font=(DEFAULT_FONT, round(DEFAULT_FONT_SIZE * scale), "bold"),
+            anchor="e"
+        )
 
         # Draw arrays and labels
+        self.bit_cells.clear()
+        self.initial_cells.clear()
         for i in range(len(self.initial_array)):
-            x = left_margin + (i + 1) * x_spacing
-            self._draw_array_element(x, array_y, str(i + 1), scale)  # Index
-            self._draw_array_element(x, array_y + 30 * scale, str(self.bit_array[i + 1]),
-                                     scale, line_width)  # BIT array
-            self._draw_array_element(x, array_y + 60 * scale, str(self.initial_array[i]),
-                                     scale, line_width)  # Initial array
+            self._draw_array_column(i, scale, line_width)
+
+    def _draw_array_column(self, i, scale, line_width):
+        """Draw index, BIT and initial array cells for element i"""
+        x = LEFT_MARGIN * scale + (i + 1) * X_SPACING * scale
+        array_y = self._calculate_array_y_position(scale)
+        self._draw_array_element(x, array_y, str(i + 1), scale)  # Index
+        self.bit_cells[i + 1] = self._draw_array_element(
+            x, array_y + 30 * scale, str(self.bit_array[i + 1]), scale, line_width)  # BIT array
+        self.initial_cells[i + 1] = self._draw_array_element(
+            x, array_y + 60 * scale, str(self.initial_array[i]), scale, line_width)  # Initial array
 
     def _draw_array_element(self, x, y, value, scale, line_width=1):
         """Draw single array element"""
         box_size = NODE_RADIUS * scale
-        self.canvas.create_rectangle(
+        rect_id = self.canvas.create_rectangle(
             x - box_size, y - box_size,
             x + box_size, y + box_size,
             outline="black",
@@ -342,6 +425,7 @@ class BITVisualizer:
             text=value,
             font=(DEFAULT_FONT, round(DEFAULT_FONT_SIZE * scale))
         )
+        return rect_id
 
     def draw_rsb_labels(self, scale):
         """Draw RSB labels"""
@@ -444,44 +528,18 @@ class BITVisualizer:
         self.canvas.itemconfig(text_id, state='normal')
         self.canvas.itemconfig(index_id, state='normal')
 
-    def animate_node_removal(self, node_ids, duration):
-        """Animate node disappearance"""
-        node_id, text_id, index_id = node_ids
-        steps = ANIMATION_STEPS
-
-        # Get original coordinates
-        coords = self.canvas.coords(node_id)
-        center_x = (coords[0] + coords[2]) / 2
-        center_y = (coords[1] + coords[3]) / 2
-        original_radius = (coords[2] - coords[0]) / 2
-
-        # Hide text and index
-        self.canvas.itemconfig(text_id, state='hidden')
-        self.canvas.itemconfig(index_id, state='hidden')
-
-        # Shrink circle
-        for i in range(steps - 1, -1, -1):
-            if not self.animation_running and self.control_panel.get_mode() == "automatic":
-                break
-            current_r = (i + 1) * original_radius / steps
-            self.canvas.coords(node_id,
-                               center_x - current_r, center_y - current_r,
-                               center_x + current_r, center_y + current_r)
-            self.canvas.update()
-            time.sleep(duration / steps)
-
-    def execute_step(self, step, reverse=False, force_draw=False):
+    def execute_step(self, step, force_draw=False):
         """Execute animation step"""
         scale = self.control_panel.get_scale_value() * self.application.scale_factor
         visual_props = calculate_visual_properties(scale)
         duration = 0 if force_draw else 1.0 / self.control_panel.get_speed()
 
         if step['type'] == 'leaf_node':
-            self._execute_leaf_node_step(step, reverse, force_draw, scale, duration)
+            self._execute_leaf_node_step(step, force_draw, scale, duration)
         elif step['type'] == 'parent_with_children':
-            self._execute_parent_children_step(step, reverse, force_draw, scale, duration, visual_props)
+            self._execute_parent_children_step(step, force_draw, scale, duration, visual_props)
         elif step['type'] == 'root_with_connections':
-            self._execute_root_step(step, reverse, force_draw, scale, duration, visual_props)
+            self._execute_root_step(step, force_draw, scale, duration, visual_props)
 
     def update_controls(self):
         """Update control panel state"""
@@ -567,15 +625,14 @@ class BITVisualizer:
                 self.update_controls()
 
     def prev_step(self):
-        """Execute previous step in manual mode"""
+        """Step back in manual mode by switching to the previous version"""
         if (not self.initialized or self.step_in_progress or
                 self.current_step <= 0 or self.is_cleaning_up):
             return
 
         self.step_in_progress = True
         try:
-            self.current_step -= 1
-            self.execute_step(self.animation_steps[self.current_step], reverse=True)
+            self.switch_to_version(self.current_step - 1)
         except tk.TclError:
             pass
         finally:
@@ -583,6 +640,28 @@ class BITVisualizer:
             if not self.is_cleaning_up:
                 self.update_controls()
 
+    def switch_to_version(self, step):
+        """Show the tree as it was after the given number of steps"""
+        # Each drawn node already shows its final value, so undoing a step only deletes its items
+        for animation_step in reversed(self.animation_steps[step:self.current_step]):
+            self._remove_step_items(animation_step)
+        self.current_step = step
+        self.highlight_query()
+
+    def _remove_step_items(self, step):
+        """Delete the node and arrows drawn by one step without animation"""
+        if step['type'] == 'root_with_connections':
+            self._remove_root()
+            return
+
+        index = step['node']['index'] if step['type'] == 'leaf_node' else step['parent']['index']
+        for child in step.get('children', ()):
+            arrow = self.arrows.pop(f"{index}-{child['index']}", None)
+            if arrow is not None:
+                self.canvas.delete(arrow)
+        for item in self.nodes.pop(index, ()):
+            self.canvas.delete(item)
+
     def scale_changed(self, value):
         """Handle scale change"""
         if not self.initialized:
@@ -605,11 +684,68 @@ class BITVisualizer:
             for step in self.animation_steps[:self.current_step]:
                 self.execute_step(step, force_draw=True)
 
+            self.highlight_query()
             self.update_controls()
 
         except Exception as e:
             print(f"Error during scaling: {e}")
 
+    def show_query(self):
+        """Parse the query range and highlight the nodes that answer it"""
+        if not self.initialized or self.animation_running or self.step_in_progress:
+            return
+
+        try:
+            bounds = list(map(int, self.control_panel.query_entry.get().split(',')))
+            if len(bounds) not in (1, 2):
+                raise ValueError
+            left, right = bounds if len(bounds) == 2 else (1, bounds[0])
+            if not 1 <= left <= right <= len(self.initial_array):
+                raise ValueError
+        except ValueError:
+            messagebox.showerror(
+                "Error", f"Please enter an index or a range 'l,r' within 1..{len(self.initial_array)}")
+            return
+
+        if left > 1 and self.operation.inverse is None and self.operation not in (MIN, MAX):
+            messagebox.showerror(
+                "Error", f"'{self.operation.name}' has no inverse, so only prefix queries are possible")
+            return
+
+        self.query_range = (left, right)
+        self.highlight_query()
+
+    def highlight_query(self):
+        """Color the nodes and array cells read by the current query"""
+        for node_ids in self.nodes.values():
+            self.canvas.itemconfig(node_ids[0], fill=NODE_COLOR)
+        for cell in list(self.bit_cells.values()) + list(self.initial_cells.values()):
+            self.canvas.itemconfig(cell, fill='')
+
+        if self.query_range is None:
+            return
+        left, right = self.query_range
+
+        # Min and max use the two-tree query; invertible operations subtract one prefix from another
+        if self.operation in (MIN, MAX):
+            contributions = range_query_nodes(len(self.initial_array), left, right)
+        else:
+            contributions = [('bit', node) for node in prefix_query_nodes(right)]
+            contributions += [('subtract', node) for node in prefix_query_nodes(left - 1)]
+
+        n = len(self.initial_array)
+        for kind, index in contributions:
+            if kind in ('bit', 'subtract'):
+                color = QUERY_NODE_COLOR if kind == 'bit' else QUERY_SUBTRACT_COLOR
+                self.canvas.itemconfig(self.bit_cells[index], fill=color)
+                if index in self.nodes:
+                    self.canvas.itemconfig(self.nodes[index][0], fill=color)
+            else:
+                # Mirrored nodes cover index .. index + RSB - 1, which the tree does not draw
+                end = index if kind == 'value' else min(n, index + (index & -index) - 1)
+                for position in range(index, end + 1):
+                    self.canvas.itemconfig(self.initial_cells[position], fill=QUERY_MIRROR_COLOR)
+
     def mode_changed(self):
         """Handle animation mode change"""
         if self.animation_running:
@@ -623,8 +759,8 @@ class BITVisualizer:
 
         success = save_state(
             initial_array=self.initial_array,
-            bit_array=self.bit_array,
-            current_step=self.current_step
+            current_step=self.current_step,
+            operation=self.operation.name
         )
 
         if success:
@@ -639,6 +775,7 @@ class BITVisualizer:
         # Update input field
         self.control_panel.input_entry.delete(0, tk.END)
         self.control_panel.input_entry.insert(0, ','.join(map(str, state['initial_array'])))
+        self.control_panel.operation_var.set(state['operation'])
 
         # Initialize with loaded state
         self.initialize_bit(state['current_step'])
@@ -648,83 +785,66 @@ class BITVisualizer:
         # Update visualization
         self.scale_changed("placeholder")
 
-    def _execute_leaf_node_step(self, step, reverse, force_draw, scale, duration):
+    def _execute_leaf_node_step(self, step, force_draw, scale, duration):
         """Execute leaf node animation step"""
-        if not reverse:
-            node = step['node']
-            node_ids = self.animate_node(
-                node['position'][0], node['position'][1],
-                node['value'], node['index'],
-                duration, scale, force_draw
-            )
-            self.nodes[node['index']] = node_ids
-        else:
-            if step['node']['index'] in self.nodes:
-                node_ids = self.nodes[step['node']['index']]
-                self.animate_node_removal(node_ids, duration)
-                for item in node_ids:
-                    self.canvas.delete(item)
-                del self.nodes[step['node']['index']]
-
-    def _execute_parent_children_step(self, step, reverse, force_draw, scale, duration, visual_props):
+        node = step['node']
+        node_ids = self.animate_node(
+            node['position'][0], node['position'][1],
+            node['value'], node['index'],
+            duration, scale, force_draw
+        )
+        self.nodes[node['index']] = node_ids
+
+    def _execute_parent_children_step(self, step, force_draw, scale, duration, visual_props):
         """Execute parent-children animation step"""
-        if not reverse:
-            # Create parent node
-            parent = step['parent']
-            parent_pos = parent['position']
-            node_ids = self.animate_node(
-                parent_pos[0], parent_pos[1],
-                parent['value'], parent['index'],
-                duration, scale, force_draw
+        # Create parent node
+        parent = step['parent']
+        parent_pos = parent['position']
+        node_ids = self.animate_node(
+            parent_pos[0], parent_pos[1],
+            parent['value'], parent['index'],
+            duration, scale, force_draw
+        )
+        self.nodes[parent['index']] = node_ids
+
+        # Draw arrows
+        arrows_to_draw = []
+        for child in step['children']:
+            arrow_data = self._prepare_arrow(
+                parent_pos, child['position'],
+                parent['index'], child['index'],
+                scale, visual_props
             )
-            self.nodes[parent['index']] = node_ids
-
-            # Draw arrows
-            arrows_to_draw = []
-            for child in step['children']:
-                arrow_data = self._prepare_arrow(
-                    parent_pos, child['position'],
-                    parent['index'], child['index'],
-                    scale, visual_props
-                )
-                arrows_to_draw.append(arrow_data)
-
-            if not force_draw:
-                self._animate_arrows(arrows_to_draw, duration)
-                self._animate_value_transfers(step, scale, duration)
+            arrows_to_draw.append(arrow_data)
 
-            # Update parent node value
-            self.canvas.itemconfig(
-                self.nodes[parent['index']][1],
-                text=str(step['final_value'])
-            )
+        if not force_draw:
+            self._animate_arrows(arrows_to_draw, duration)
+            self._animate_value_transfers(step, scale, duration)
 
-        else:
-            # Reverse animation logic...
-            self._reverse_parent_children(step, duration)
+        # Update parent node value
+        self.canvas.itemconfig(
+            self.nodes[parent['index']][1],
+            text=str(step['final_value'])
+        )
 
-    def _execute_root_step(self, step, reverse, force_draw, scale, duration, visual_props):
+    def _execute_root_step(self, step, force_draw, scale, duration, visual_props):
         """Execute root node animation step"""
-        if not reverse:
-            # Add root node
-            x, y = step['position']
-            self.root_node = self.animate_node(x, y, 'R', 'R', duration, scale, force_draw)
-
-            # Add connections
-            arrows_to_draw = []
-            for conn in step['connections']:
-                arrow_data = self._prepare_arrow(
-                    (x, y), conn['position'],
-                    'root', conn['node'],
-                    scale, visual_props
-                )
-                arrows_to_draw.append(arrow_data)
-
-            if not force_draw:
-                self._animate_arrows(arrows_to_draw, duration)
+        # Add root node
+        x, y = step['position']
+        self.root_node = self.animate_node(x, y, 'R', 'R', duration, scale, force_draw)
+
+        # Add connections
+        arrows_to_draw = []
+        for conn in step['connections']:
+            arrow_data = self._prepare_arrow(
+                (x, y), conn['position'],
+                'root', conn['node'],
+                scale, visual_props
+            )
+            arrows_to_draw.append(arrow_data)
 
-        else:
-            self._reverse_root_step(step, duration)
+        if not force_draw:
+            self._animate_arrows(arrows_to_draw, duration)
 
     def _prepare_arrow(self, start_pos, end_pos, from_id, to_id, scale, visual_props):
         """Prepare arrow data for animation"""
@@ -793,7 +913,7 @@ class BITVisualizer:
 
             text_data = self._create_moving_text(
                 from_coords, to_coords,
-                transfer['value'], scale
+                f"{self.operation.symbol} {transfer['value']}", scale
             )
             moving_texts.append(text_data)
 
@@ -837,91 +957,4 @@ class BITVisualizer:
 
         # Clean up moving texts
         for text in moving_texts:
-            self.canvas.delete(text['id'])
-
-    def _reverse_parent_children(self, step, duration):
-        """Reverse parent-children animation step"""
-        parent_idx = step['parent']['index']
-
-        # Animate value transfers back to children
-        if 'value_transfers' in step:
-            self._reverse_value_transfers(step, duration)
-
-        # Remove arrows
-        self._remove_arrows(
-            [f"{parent_idx}-{child['index']}" for child in step['children']],
-            duration
-        )
-
-        # Remove parent node
-        if parent_idx in self.nodes:
-            self.animate_node_removal(self.nodes[parent_idx], duration)
-            for item in self.nodes[parent_idx]:
-                self.canvas.delete(item)
-            del self.nodes[parent_idx]
-
-    def _reverse_value_transfers(self, step, duration):
-        """Reverse value transfer animations"""
-        moving_texts = []
-        parent_idx = step['parent']['index']
-
-        for transfer in step['value_transfers']:
-            from_node = self.nodes[parent_idx][0]
-            to_node = self.nodes[transfer['from']][0]
-
-            from_coords = self.canvas.coords(from_node)
-            to_coords = self.canvas.coords(to_node)
-
-            text_data = self._create_moving_text(
-                from_coords, to_coords,
-                transfer['value'],
-                self.control_panel.get_scale_value() * self.application.scale_factor
-            )
-            moving_texts.append(text_data)
-
-        self._animate_moving_texts(moving_texts, duration)
-
-    def _remove_arrows(self, arrow_keys, duration):
-        """Remove arrows with animation"""
-        arrows_to_remove = []
-        for arrow_key in arrow_keys:
-            if arrow_key in self.arrows:
-                coords = self.canvas.coords(self.arrows[arrow_key])
-                arrows_to_remove.append({
-                    'id': self.arrows[arrow_key],
-                    'start': (coords[0], coords[1]),
-                    'end': (coords[2], coords[3])
-                })
-
-        steps = ANIMATION_STEPS
-        for i in range(steps - 1, -1, -1):
-            progress = i / steps
-            for arrow in arrows_to_remove:
-                current_x = arrow['start'][0] + (arrow['end'][0] - arrow['start'][0]) * progress
-                current_y = arrow['start'][1] + (arrow['end'][1] - arrow['start'][1]) * progress
-                self.canvas.coords(
-                    arrow['id'],
-                    arrow['start'][0], arrow['start'][1],
-                    current_x, current_y
-                )
-            self.canvas.update()
-            time.sleep(duration / steps)
-
-        # Delete arrows
-        for arrow_key in arrow_keys:
-            if arrow_key in self.arrows:
-                self.canvas.delete(self.arrows[arrow_key])
-                del self.arrows[arrow_key]
-
-    def _reverse_root_step(self, step, duration):
-        """Reverse root node animation step"""
-        # Remove root connections
-        arrow_keys = [f"root-{conn['node']}" for conn in step['connections']]
-        self._remove_arrows(arrow_keys, duration)
-
-        # Remove root node
-        if hasattr(self, 'root_node'):
-            self.animate_node_removal(self.root_node, duration)
-            for item in self.root_node:
-                self.canvas.delete(item)
-            delattr(self, 'root_node')
\ No newline at end of file
+            self.canvas.delete(text['id'])
\ No newline at end of file
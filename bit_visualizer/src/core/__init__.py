@@ -1,12 +1,78 @@
-from .bit_operations import calculate_bit_array, calculate_levels, find_parentless_nodes
+from .bit_operations import (calculate_bit_array, calculate_initial_array, calculate_prefix_sums,
+                             prefix_query_nodes, calculate_levels, find_parentless_nodes)
+from .parallel_build import calculate_bit_array_parallel
 from .animation import prepare_animation_steps
 from .file_operations import save_state, load_state
+from .operations import Operation, SUM, XOR, MIN, MAX, PRODUCT, OPERATIONS, modular_sum, modular_product
+from .fenwick import FenwickTree, iter_stream_values, stream_build
+from .snapshot import FenwickSnapshot
+from .sparse_fenwick import SparseFenwickTree
+from .mmap_fenwick import MmapFenwickTree
+from .shared_fenwick import SharedFenwickTree
+from .sharded_fenwick import ShardedFenwickTree
+from .persistent_fenwick import PersistentFenwickTree
+from .float_fenwick import FloatFenwickTree
+from .minmax_fenwick import MinMaxFenwickTree, range_query_nodes
+from .segment_tree import SegmentTree
+from .sqrt_decomposition import SqrtDecomposition
+from .range_fenwick import RangeFenwickTree
+from .blocked_fenwick import BlockedFenwickTree
+from .adaptive import AdaptiveEngine, PrefixSumArray
+from .prefix_cache import PrefixCache
+from .query_cache import LRUPrefixCache
+from .sliding_window import SlidingWindowFenwick
+from .multiset import FenwickMultiset
+from .applications import (compress, count_inversions, count_inversions_chunked,
+                           count_inversions_many, distinct_in_ranges)
+from .concurrent_fenwick import ConcurrentFenwickTree, RWLock
 
 __all__ = [
     'calculate_bit_array',
+    'calculate_initial_array',
+    'calculate_prefix_sums',
+    'calculate_bit_array_parallel',
+    'prefix_query_nodes',
     'calculate_levels',
     'find_parentless_nodes',
     'prepare_animation_steps',
     'save_state',
-    'load_state'
+    'load_state',
+    'Operation',
+    'SUM',
+    'XOR',
+    'MIN',
+    'MAX',
+    'PRODUCT',
+    'OPERATIONS',
+    'modular_sum',
+    'modular_product',
+    'FenwickTree',
+    'iter_stream_values',
+    'stream_build',
+    'FenwickSnapshot',
+    'SparseFenwickTree',
+    'MmapFenwickTree',
+    'SharedFenwickTree',
+    'ShardedFenwickTree',
+    'PersistentFenwickTree',
+    'FloatFenwickTree',
+    'MinMaxFenwickTree',
+    'range_query_nodes',
+    'SegmentTree',
+    'SqrtDecomposition',
+    'RangeFenwickTree',
+    'BlockedFenwickTree',
+    'AdaptiveEngine',
+    'PrefixSumArray',
+    'PrefixCache',
+    'LRUPrefixCache',
+    'SlidingWindowFenwick',
+    'FenwickMultiset',
+    'compress',
+    'count_inversions',
+    'count_inversions_chunked',
+    'count_inversions_many',
+    'distinct_in_ranges',
+    'ConcurrentFenwickTree',
+    'RWLock'
 ]
\ No newline at end of file
@@ -0,0 +1,179 @@
+from collections import deque
+from itertools import accumulate
+
+from .fenwick import FenwickTree
+from .range_fenwick import RangeFenwickTree
+
+
+class PrefixSumArray:
+    """Plain prefix-sum array: O(1) queries, O(n) updates"""
+
+    def __init__(self, initial_array=()):
+        self.prefix_sums = [0] + list(accumulate(initial_array))
+
+    def __len__(self):
+        return len(self.prefix_sums) - 1
+
+    def range_add(self, left, right, delta):
+        """Add delta to every value at positions left..right inclusive"""
+        n = len(self.prefix_sums) - 1
+        if not 1 <= left <= right <= n:
+            raise IndexError(f"Range {left}..{right} out of range 1..{n}")
+
+        prefix_sums = self.prefix_sums
+        added = 0
+        for i in range(left, n + 1):
+            if i <= right:
+                added += delta
+            prefix_sums[i] += added
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index"""
+        self.range_add(index, index, delta)
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        if not 0 <= index <= len(self.prefix_sums) - 1:
+            raise IndexError(f"Index {index} out of range 0..{len(self.prefix_sums) - 1}")
+        return self.prefix_sums[index]
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        if left > right:
+            return 0
+        return self.prefix(right) - self.prefix(left - 1)
+
+    def to_array(self):
+        """Recover the current element values in O(n)"""
+        prefix_sums = self.prefix_sums
+        return [prefix_sums[i] - prefix_sums[i - 1] for i in range(1, len(prefix_sums))]
+
+
+def _fenwick_range_add(tree, left, right, delta):
+    tree.apply_updates(range(left, right + 1), [delta] * (right - left + 1))
+
+
+# Representations the facade can migrate between, keyed by name
+REPRESENTATIONS = {
+    'prefix': PrefixSumArray,
+    'fenwick': FenwickTree,
+    'range_fenwick': RangeFenwickTree
+}
+
+
+# Most recent window decisions kept for inspection
+DECISION_LOG_SIZE = 1000
+
+
+def estimate_costs(n, reads, updates, range_updates, range_length):
+    """Estimated node touches per representation for one window of operations"""
+    log_n = max(1, n.bit_length())
+    average_length = range_length / range_updates if range_updates else 0
+    return {
+        'prefix': reads + (updates + range_updates) * n / 2,
+        'fenwick': (reads + updates) * log_n + range_updates * min(average_length * log_n, n),
+        'range_fenwick': (reads + updates + range_updates) * 4 * log_n
+    }
+
+
+class AdaptiveEngine:
+    """Facade that samples the operation mix and migrates to the cheapest representation"""
+
+    def __init__(self, initial_array=(), representation='fenwick', window=1024,
+                 margin=0.25, patience=2):
+        self.name = representation
+        self.engine = REPRESENTATIONS[representation](initial_array)
+        self.window = window
+        # Hysteresis: another representation must be cheaper by margin for patience windows in a row
+        self.margin = margin
+        self.patience = patience
+
+        self._reads = 0
+        self._updates = 0
+        self._range_updates = 0
+        self._range_length = 0
+        self._candidate = None
+        self._streak = 0
+        self.windows = 0
+        self.decisions = deque(maxlen=DECISION_LOG_SIZE)
+        self.stats = {
+            'reads': 0,
+            'updates': 0,
+            'range_updates': 0,
+            'migrations': 0
+        }
+
+    def __len__(self):
+        return len(self.engine)
+
+    def _record(self):
+        if self._reads + self._updates + self._range_updates >= self.window:
+            self._evaluate()
+
+    def _evaluate(self):
+        """Close the current window and migrate when another representation has kept winning"""
+        costs = estimate_costs(len(self.engine), self._reads, self._updates,
+                               self._range_updates, self._range_length)
+        self.windows += 1
+        self._reads = self._updates = self._range_updates = self._range_length = 0
+
+        best = min(costs, key=costs.get)
+        if best != self.name and costs[best] < costs[self.name] * (1 - self.margin):
+            self._streak = self._streak + 1 if best == self._candidate else 1
+            self._candidate = best
+        else:
+            self._candidate = None
+            self._streak = 0
+
+        decision = {
+            'window': self.windows,
+            'representation': self.name,
+            'costs': costs,
+            'migrated_to': None
+        }
+        if self._candidate is not None and self._streak >= self.patience:
+            self.engine = REPRESENTATIONS[best](self.engine.to_array())
+            decision['migrated_to'] = best
+            self.name = best
+            self._candidate = None
+            self._streak = 0
+            self.stats['migrations'] += 1
+        self.decisions.append(decision)
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index"""
+        self.engine.update(index, delta)
+        self._updates += 1
+        self.stats['updates'] += 1
+        self._record()
+
+    def range_add(self, left, right, delta):
+        """Add delta to every value at positions left..right inclusive"""
+        if self.name == 'fenwick':
+            _fenwick_range_add(self.engine, left, right, delta)
+        else:
+            self.engine.range_add(left, right, delta)
+        self._range_updates += 1
+        self._range_length += right - left + 1
+        self.stats['range_updates'] += 1
+        self._record()
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        result = self.engine.prefix(index)
+        self._reads += 1
+        self.stats['reads'] += 1
+        self._record()
+        return result
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        result = self.engine.range_sum(left, right)
+        self._reads += 1
+        self.stats['reads'] += 1
+        self._record()
+        return result
+
+    def to_array(self):
+        """Recover the current element values"""
+        return self.engine.to_array()
@@ -0,0 +1,107 @@
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+from .bit_operations import np
+from .fenwick import FenwickTree
+
+
+def compress(values):
+    """Map values to dense 1-based ranks, preserving order"""
+    if np is not None:
+        # Vectorized: unique sorts once, searchsorted ranks every element in C
+        array = np.asarray(values)
+        if array.dtype != object:
+            ranks = np.searchsorted(np.unique(array), array) + 1
+            return ranks.tolist()
+
+    ordered = sorted(set(values))
+    rank_of = {value: rank for rank, value in enumerate(ordered, start=1)}
+    return [rank_of[value] for value in values]
+
+
+def _count_with_tree(tree, seen, ranks):
+    """Add ranks to the tree in order, returning how many earlier ranks exceed each"""
+    inversions = 0
+    for rank in ranks:
+        inversions += seen - tree.prefix(rank)
+        tree.update(rank, 1)
+        seen += 1
+    return inversions, seen
+
+
+def count_inversions(values):
+    """Number of pairs i < j with values[i] > values[j], in O(n log n)"""
+    ranks = compress(values)
+    if not ranks:
+        return 0
+    tree = FenwickTree([0] * max(ranks))
+    inversions, _ = _count_with_tree(tree, 0, ranks)
+    return inversions
+
+
+def count_inversions_chunked(chunks, keys=None):
+    """Count inversions over a sequence too large for memory, given as chunks
+
+    chunks is a callable returning a fresh iterable of chunks. Without keys it is
+    read twice: once to collect the distinct values, once to count. Memory grows
+    with the number of distinct values rather than the length of the sequence.
+    """
+    if keys is None:
+        distinct = set()
+        for chunk in chunks():
+            distinct.update(chunk)
+        keys = distinct
+    keys = sorted(set(keys))
+    if not keys:
+        return 0
+
+    sorted_keys = keys
+    if np is not None:
+        sorted_keys = np.asarray(keys)
+        if sorted_keys.dtype == object:
+            sorted_keys = keys
+
+    tree = FenwickTree([0] * len(keys))
+    inversions = 0
+    seen = 0
+    for chunk in chunks():
+        if sorted_keys is keys:
+            ranks = [bisect_left(keys, value) + 1 for value in chunk]
+        else:
+            ranks = (np.searchsorted(sorted_keys, np.asarray(chunk)) + 1).tolist()
+        chunk_inversions, seen = _count_with_tree(tree, seen, ranks)
+        inversions += chunk_inversions
+    return inversions
+
+
+def count_inversions_many(arrays, processes=None, chunksize=1):
+    """Count inversions of many arrays at once across a process pool"""
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(count_inversions, arrays, chunksize=chunksize))
+
+
+def distinct_in_ranges(values, queries):
+    """Number of distinct values in each 1-based inclusive (left, right) range, answered offline"""
+    n = len(values)
+    for left, right in queries:
+        if not 1 <= left <= right <= n:
+            raise IndexError(f"Range {left}..{right} out of range 1..{n}")
+
+    # Sweep right ends in order, counting each value only at its latest occurrence so far
+    order = sorted(range(len(queries)), key=lambda q: queries[q][1])
+    tree = FenwickTree([0] * n)
+    last_seen = {}
+    answers = [0] * len(queries)
+    position = 0
+    for q in order:
+        left, right = queries[q]
+        while position < right:
+            position += 1
+            value = values[position - 1]
+            previous = last_seen.get(value)
+            if previous is not None:
+                tree.update(previous, -1)
+            tree.update(position, 1)
+            last_seen[value] = position
+        answers[q] = tree.range_sum(left, right)
+    return answers
@@ -1,5 +1,16 @@
-def calculate_bit_array(initial_array):
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .operations import SUM, XOR
+
+
+def calculate_bit_array(initial_array, operation=None):
     """Calculate BIT array values from initial array"""
+    if operation is not None and operation is not SUM:
+        return _calculate_bit_array_with(initial_array, operation)
+
     bit_array = [0] * (len(initial_array) + 1)
 
     # Initialize BIT array
@@ -15,6 +26,92 @@ def calculate_bit_array(initial_array):
     return bit_array
 
 
+def _calculate_bit_array_with(initial_array, operation):
+    """Calculate BIT array values using an associative operation other than sum"""
+    bit_array = [operation.identity] + list(initial_array)
+    n = len(initial_array)
+
+    if operation is XOR:
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                bit_array[parent] ^= bit_array[i]
+        return bit_array
+
+    combine = operation.combine
+    for i in range(1, n + 1):
+        parent = i + (i & -i)
+        if parent <= n:
+            bit_array[parent] = combine(bit_array[parent], bit_array[i])
+    return bit_array
+
+
+def calculate_initial_array(bit_array, operation=None):
+    """Recover the initial array from BIT array values in O(n)"""
+    n = len(bit_array) - 1
+    if operation is not None and operation is not SUM:
+        if operation.inverse is None:
+            raise ValueError(f"Operation '{operation.name}' has no inverse")
+        values = list(bit_array)
+        inverse = operation.inverse
+        for i in range(n, 0, -1):
+            parent = i + (i & -i)
+            if parent <= n:
+                values[parent] = inverse(values[parent], values[i])
+        return values[1:]
+
+    if np is not None and isinstance(bit_array, np.ndarray):
+        values = bit_array.copy()
+        # Within one RSB level every node has a distinct parent, so each level is one vector op
+        rsb = 1
+        while rsb <= n:
+            nodes = np.arange(rsb, n + 1, 2 * rsb)
+            parents = nodes + rsb
+            nodes = nodes[parents <= n]
+            values[nodes + rsb] -= bit_array[nodes]
+            rsb *= 2
+        return values[1:]
+
+    values = list(bit_array)
+
+    # Undo the parent recurrence from the top, while each node still holds its full sum
+    for i in range(n, 0, -1):
+        parent = i + (i & -i)
+        if parent <= n:
+            values[parent] -= values[i]
+
+    return values[1:]
+
+
+def calculate_prefix_sums(bit_array, operation=None):
+    """Calculate all n prefix sums from BIT array values in O(n)"""
+    n = len(bit_array) - 1
+    if operation is not None and operation is not SUM:
+        combine = operation.combine
+        prefix_sums = [operation.identity] * (n + 1)
+        for i in range(1, n + 1):
+            prefix_sums[i] = combine(prefix_sums[i - (i & -i)], bit_array[i])
+        return prefix_sums[1:]
+
+    if np is not None and isinstance(bit_array, np.ndarray):
+        return np.cumsum(calculate_initial_array(bit_array))
+
+    prefix_sums = [0] * (n + 1)
+    for i in range(1, n + 1):
+        prefix_sums[i] = prefix_sums[i - (i & -i)] + bit_array[i]
+
+    return prefix_sums[1:]
+
+
+def prefix_query_nodes(index):
+    """Nodes summed by a prefix query at index, from index down"""
+    nodes = []
+    while index > 0:
+        nodes.append(index)
+        index -= index & -index
+    return nodes
+
+
 def calculate_levels(n):
     """Calculate levels for each node based on RSB"""
     levels = {}
@@ -0,0 +1,132 @@
+from array import array
+from itertools import accumulate
+
+from .fenwick import FenwickTree
+
+# Elements per block; 64 int64 prefixes span eight 64-byte cache lines
+DEFAULT_BLOCK_SIZE = 64
+
+
+class BlockedFenwickTree:
+    """Per-block prefix sums under a small top-level Fenwick tree of block totals"""
+
+    def __init__(self, initial_array=(), block_size=DEFAULT_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        values = list(initial_array)
+        self.n = len(values)
+        self.block_size = block_size
+
+        # local[i] is the sum of its block's values up to and including position i + 1,
+        # so a prefix query reads one contiguous slot plus log(n / B) top-level nodes
+        local = []
+        totals = []
+        for start in range(0, self.n, block_size):
+            block = list(accumulate(values[start:start + block_size]))
+            local.extend(block)
+            totals.append(block[-1])
+
+        self.storage = 'object'
+        try:
+            self.local = array('q', local)
+            self.storage = 'int64'
+        except (OverflowError, TypeError):
+            self.local = local
+        self.top = FenwickTree(totals)
+        self.stats = {
+            'storage_promotions': 0,
+            'point_updates': 0,
+            'batch_updates': 0,
+            'local_writes': 0
+        }
+
+    def __len__(self):
+        return self.n
+
+    def _promote(self):
+        """Switch local prefix storage from int64 to Python ints"""
+        self.local = self.local.tolist()
+        self.storage = 'object'
+        self.stats['storage_promotions'] += 1
+
+    def _add_local(self, first, end, delta):
+        """Add delta to local prefixes first..end - 1, 0-based"""
+        local = self.local
+        i = first
+        try:
+            while i < end:
+                local[i] += delta
+                i += 1
+        except (OverflowError, TypeError):
+            if self.storage != 'int64':
+                raise
+            self._promote()
+            self._add_local(i, end, delta)
+        self.stats['local_writes'] += end - first
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index in O(B + log(n / B))"""
+        if not 1 <= index <= self.n:
+            raise IndexError(f"Index {index} out of range 1..{self.n}")
+        block = (index - 1) // self.block_size
+        end = min((block + 1) * self.block_size, self.n)
+        self._add_local(index - 1, end, delta)
+        self.top.update(block + 1, delta)
+        self.stats['point_updates'] += 1
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index in O(log(n / B))"""
+        if not 0 <= index <= self.n:
+            raise IndexError(f"Index {index} out of range 0..{self.n}")
+        if not index:
+            return 0
+        return self.top.prefix((index - 1) // self.block_size) + self.local[index - 1]
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        if left > right:
+            return 0
+        return self.prefix(right) - self.prefix(left - 1)
+
+    def to_array(self):
+        """Recover the current element values in O(n)"""
+        local = self.local
+        size = self.block_size
+        return [local[i] - local[i - 1] if i % size else local[i] for i in range(self.n)]
+
+    def apply_updates(self, indices, deltas):
+        """Apply a batch of point updates, rewriting each touched block suffix once"""
+        indices = list(indices)
+        deltas = list(deltas)
+        if len(indices) != len(deltas):
+            raise ValueError("indices and deltas must have the same length")
+
+        # Group by block so every block is swept once from its lowest touched position
+        blocks = {}
+        for index, delta in zip(indices, deltas):
+            if not 1 <= index <= self.n:
+                raise IndexError(f"Index {index} out of range 1..{self.n}")
+            block = blocks.setdefault((index - 1) // self.block_size, {})
+            block[index - 1] = block.get(index - 1, 0) + delta
+
+        for block, pending in blocks.items():
+            end = min((block + 1) * self.block_size, self.n)
+            first = min(pending)
+            running = 0
+            local = self.local
+            for i in range(first, end):
+                running += pending.get(i, 0)
+                if running:
+                    try:
+                        local[i] += running
+                    except (OverflowError, TypeError):
+                        if self.storage != 'int64':
+                            raise
+                        self._promote()
+                        local = self.local
+                        local[i] += running
+            self.stats['local_writes'] += end - first
+
+        self.top.apply_updates([block + 1 for block in blocks],
+                               [sum(pending.values()) for pending in blocks.values()])
+        self.stats['batch_updates'] += 1
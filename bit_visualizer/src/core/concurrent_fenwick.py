@@ -0,0 +1,188 @@
+import threading
+
+from .operations import SUM
+
+
+class RWLock:
+    """Lock allowing many concurrent readers or a single writer"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writer:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        with self._condition:
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writer = True
+
+    def release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+
+class ConcurrentFenwickTree:
+    """Thread-safe wrapper over a FenwickTree using striped or reader/writer locking"""
+
+    MODES = ('striped', 'rwlock')
+
+    def __init__(self, tree, mode='striped', stripe_size=64):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown locking mode: {mode}")
+        self.tree = tree
+        self.mode = mode
+        self.stripe_size = stripe_size
+
+        # Striped writers touch nodes in place, so a later int64 promotion that swaps the
+        # buffer could lose concurrent writes; promote up front instead
+        if mode == 'striped' and getattr(tree, 'storage', 'object') == 'int64':
+            tree._promote()
+
+        # Stripe s guards nodes s * stripe_size .. (s + 1) * stripe_size - 1; more stripes
+        # are added if the wrapped tree grows, though it must not be resized concurrently
+        stripe_count = len(tree.bit_array) // stripe_size + 1
+        self._stripes = [threading.Lock() for _ in range(stripe_count)]
+        self._grow_lock = threading.Lock()
+        # Writers under different stripes share the tree's stats dict
+        self._stats_lock = threading.Lock()
+        self._rwlock = RWLock()
+        # Serializes copy-on-write chunk copies between striped writers
+        self._snapshot_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.tree)
+
+    def _update_stripes(self, index, n):
+        stripes = []
+        while index <= n:
+            stripe = index // self.stripe_size
+            if not stripes or stripes[-1] != stripe:
+                stripes.append(stripe)
+            index += index & -index
+        return stripes
+
+    def _query_stripes(self, *indices):
+        n = len(self.tree)
+        stripes = set()
+        for index in indices:
+            if not 0 <= index <= n:
+                raise IndexError(f"Index {index} out of range 0..{n}")
+            while index > 0:
+                stripes.add(index // self.stripe_size)
+                index -= index & -index
+        return sorted(stripes)
+
+    def _grow_stripes(self, stripe):
+        with self._grow_lock:
+            while len(self._stripes) <= stripe:
+                self._stripes.append(threading.Lock())
+
+    def _lock_stripes(self, stripes):
+        if stripes and stripes[-1] >= len(self._stripes):
+            self._grow_stripes(stripes[-1])
+        # Stripes are always taken in ascending order, so updates and queries cannot deadlock
+        for stripe in stripes:
+            self._stripes[stripe].acquire()
+
+    def _unlock_stripes(self, stripes):
+        for stripe in reversed(stripes):
+            self._stripes[stripe].release()
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index"""
+        if self.mode == 'rwlock':
+            self._rwlock.acquire_write()
+            try:
+                self.tree.update(index, delta)
+            finally:
+                self._rwlock.release_write()
+            return
+
+        n = len(self.tree)
+        if not 1 <= index <= n:
+            raise IndexError(f"Index {index} out of range 1..{n}")
+
+        stripes = self._update_stripes(index, n)
+        bit_array = self.tree.bit_array
+        self._lock_stripes(stripes)
+        try:
+            if self.tree._snapshots:
+                with self._snapshot_lock:
+                    self.tree._preserve_path(index, n)
+            if self.tree.operation is SUM:
+                while index <= n:
+                    bit_array[index] += delta
+                    index += index & -index
+            else:
+                combine = self.tree.operation.combine
+                while index <= n:
+                    bit_array[index] = combine(bit_array[index], delta)
+                    index += index & -index
+            with self._stats_lock:
+                self.tree.stats['point_updates'] += 1
+        finally:
+            self._unlock_stripes(stripes)
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        if self.mode == 'rwlock':
+            self._rwlock.acquire_read()
+            try:
+                return self.tree.prefix(index)
+            finally:
+                self._rwlock.release_read()
+
+        stripes = self._query_stripes(index)
+        self._lock_stripes(stripes)
+        try:
+            return self.tree.prefix(index)
+        finally:
+            self._unlock_stripes(stripes)
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive, read atomically"""
+        if left > right:
+            return 0
+        if self.mode == 'rwlock':
+            self._rwlock.acquire_read()
+            try:
+                return self.tree.range_sum(left, right)
+            finally:
+                self._rwlock.release_read()
+
+        stripes = self._query_stripes(right, left - 1)
+        self._lock_stripes(stripes)
+        try:
+            return self.tree.range_sum(left, right)
+        finally:
+            self._unlock_stripes(stripes)
+
+    def snapshot(self):
+        """Copy-on-write snapshot taken while no write is in progress"""
+        if self.mode == 'rwlock':
+            self._rwlock.acquire_write()
+            try:
+                return self.tree.snapshot()
+            finally:
+                self._rwlock.release_write()
+
+        stripes = range(max(len(self._stripes), len(self.tree.bit_array) // self.stripe_size + 1))
+        self._lock_stripes(stripes)
+        try:
+            return self.tree.snapshot()
+        finally:
+            self._unlock_stripes(stripes)
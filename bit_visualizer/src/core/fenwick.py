@@ -0,0 +1,414 @@
+import re
+import sys
+import weakref
+from array import array
+
+from .bit_operations import calculate_bit_array, calculate_initial_array, calculate_prefix_sums, np
+from .operations import SUM
+from .snapshot import CHUNK_SIZE, FenwickSnapshot, copy_chunk
+
+# Separators accepted between values in a text stream
+STREAM_SEPARATORS = re.compile(r'[\s,]+')
+
+# A batch is applied by rebuilding when k * log2(n) exceeds n * REBUILD_FACTOR
+REBUILD_FACTOR = 1.0
+
+
+class FenwickTree:
+    """Dense Fenwick tree engine over a 1-indexed bit_array"""
+
+    def __init__(self, initial_array=(), operation=None, typed=True):
+        # Sums take the inlined fast paths below; other operations go through operation.combine
+        self.operation = operation or SUM
+        self.bit_array = calculate_bit_array(list(initial_array), self.operation)
+
+        # Integer sums are kept in an int64 buffer until a node overflows it
+        self.storage = 'object'
+        if typed and self.operation is SUM:
+            try:
+                self.bit_array = array('q', self.bit_array)
+                self.storage = 'int64'
+            except (OverflowError, TypeError):
+                pass
+
+        self.stats = {
+            'storage_promotions': 0,
+            'point_updates': 0,
+            'batch_updates': 0,
+            'batch_point_strategy': 0,
+            'batch_rebuild_strategy': 0,
+            'batch_duplicates_merged': 0,
+            'snapshots_taken': 0,
+            'snapshot_chunks_copied': 0
+        }
+        # Live snapshots, and the chunk store shared by snapshots taken since the last write
+        self._snapshots = weakref.WeakSet()
+        self._snapshot_store = None
+
+    def __len__(self):
+        return len(self.bit_array) - 1
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Adopt a buffer of int64 nodes, slot 0 included, as a sum tree without copying"""
+        view = memoryview(buffer)
+        # Raw bytes are read as native int64; typed buffers must already hold native int64
+        code = view.format.lstrip('@=' + ('<' if sys.byteorder == 'little' else '>'))
+        if view.itemsize == 1 and code in ('B', 'b', 'c'):
+            if view.nbytes % 8:
+                raise ValueError(f"A byte buffer of {view.nbytes} bytes does not hold whole int64 nodes")
+        elif view.itemsize != 8 or code not in ('q', 'l'):
+            raise TypeError(f"Expected native int64 nodes, got format '{view.format}' "
+                            f"with itemsize {view.itemsize}")
+        if view.format != 'q':
+            view = view.cast('B').cast('q')
+        if not len(view):
+            raise ValueError("A node buffer needs at least the unused slot 0")
+
+        tree = cls(typed=False)
+        tree.bit_array = view
+        tree.storage = 'int64'
+        return tree
+
+    def _promotable(self):
+        """Whether int64 storage can switch to Python ints instead of failing a write"""
+        # Adopted buffers must fail rather than silently detach from the caller's memory
+        return self.storage == 'int64' and not isinstance(self.bit_array, memoryview)
+
+    def _add_adopted(self, merged, n):
+        """Apply sum updates to an adopted buffer all at once, or not at all"""
+        bit_array = self.bit_array
+        changes = {}
+        for index, delta in merged.items():
+            while index <= n:
+                changes[index] = changes.get(index, 0) + delta
+                index += index & -index
+
+        values = []
+        for node, delta in changes.items():
+            value = bit_array[node] + delta
+            if not -2 ** 63 <= value < 2 ** 63:
+                raise OverflowError(f"Node {node} would overflow the adopted int64 buffer")
+            values.append((node, value))
+        for node, value in values:
+            bit_array[node] = value
+
+    def _promote(self):
+        """Switch node storage from int64 to Python ints"""
+        self.bit_array = self.bit_array.tolist()
+        self.storage = 'object'
+        self.stats['storage_promotions'] += 1
+
+    def _detach(self):
+        """Copy an adopted fixed-size buffer into an owned, resizable array"""
+        if isinstance(self.bit_array, memoryview):
+            self.bit_array = array('q', self.bit_array)
+
+    def nodes_view(self, readonly=True):
+        """Zero-copy memoryview of the int64 nodes, slot 0 included"""
+        if self.operation is not SUM:
+            raise TypeError(f"Only sum trees keep int64 nodes; '{self.operation.name}' nodes "
+                            "are Python objects with no buffer to export")
+        if self.storage != 'int64':
+            raise TypeError("Nodes promoted to Python ints have no buffer to export")
+        # The owned array cannot be resized while a view is held, so append raises BufferError
+        view = memoryview(self.bit_array)
+        return view.toreadonly() if readonly else view
+
+    def __buffer__(self, flags):
+        return self.nodes_view()
+
+    @property
+    def __array_interface__(self):
+        """NumPy array interface sharing the nodes through a read-only view"""
+        view = self.nodes_view()
+        return {
+            'shape': (len(view),),
+            'typestr': ('<' if sys.byteorder == 'little' else '>') + 'i8',
+            'data': view,
+            'version': 3
+        }
+
+    def snapshot(self):
+        """Consistent read-only view in O(1); later writes first copy each chunk they touch"""
+        if self._snapshot_store is None or not self._snapshots:
+            self._snapshot_store = {}
+        snapshot = FenwickSnapshot(self, self._snapshot_store, len(self))
+        self._snapshots.add(snapshot)
+        self.stats['snapshots_taken'] += 1
+        return snapshot
+
+    def _preserve(self, chunks):
+        """Copy chunks about to be written into every live snapshot that still reads them live"""
+        stores = {id(snapshot.store): snapshot.store for snapshot in self._snapshots}
+        for store in stores.values():
+            for chunk in chunks:
+                if chunk not in store:
+                    store[chunk] = copy_chunk(self.bit_array, chunk)
+                    self.stats['snapshot_chunks_copied'] += 1
+        self._snapshot_store = None
+
+    def _preserve_path(self, index, n):
+        chunks = set()
+        while index <= n:
+            chunks.add(index // CHUNK_SIZE)
+            index += index & -index
+        self._preserve(chunks)
+
+    def snapshot_overhead(self):
+        """Memory held by live snapshots in chunks copied out of the tree"""
+        stores = {id(snapshot.store): snapshot.store for snapshot in self._snapshots}
+        chunks = [chunk for store in stores.values() for chunk in store.values()]
+        return {
+            'live_snapshots': len(self._snapshots),
+            'chunks': len(chunks),
+            'nodes': sum(len(chunk) for chunk in chunks),
+            'bytes': sum(sys.getsizeof(chunk) for chunk in chunks)
+        }
+
+    def _add_sum(self, index, delta, n):
+        bit_array = self.bit_array
+        try:
+            while index <= n:
+                bit_array[index] += delta
+                index += index & -index
+        except (OverflowError, TypeError, ValueError):
+            if not self._promotable():
+                raise
+            # The failed node was left unchanged, so resume from it once values are unbounded
+            self._promote()
+            self._add_sum(index, delta, n)
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index"""
+        n = len(self.bit_array) - 1
+        if not 1 <= index <= n:
+            raise IndexError(f"Index {index} out of range 1..{n}")
+        if self._snapshots:
+            self._preserve_path(index, n)
+
+        if isinstance(self.bit_array, memoryview):
+            self._add_adopted({index: delta}, n)
+        elif self.operation is SUM:
+            self._add_sum(index, delta, n)
+        else:
+            bit_array = self.bit_array
+            combine = self.operation.combine
+            while index <= n:
+                bit_array[index] = combine(bit_array[index], delta)
+                index += index & -index
+        self.stats['point_updates'] += 1
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        n = len(self.bit_array) - 1
+        if not 0 <= index <= n:
+            raise IndexError(f"Index {index} out of range 0..{n}")
+
+        bit_array = self.bit_array
+        if self.operation is SUM:
+            total = 0
+            while index > 0:
+                total += bit_array[index]
+                index -= index & -index
+            return total
+
+        combine = self.operation.combine
+        total = self.operation.identity
+        while index > 0:
+            total = combine(total, bit_array[index])
+            index -= index & -index
+        return total
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        if self.operation is SUM:
+            if left > right:
+                return 0
+            return self.prefix(right) - self.prefix(left - 1)
+
+        if self.operation.inverse is None:
+            raise ValueError(f"Operation '{self.operation.name}' has no inverse for range queries")
+        if left > right:
+            return self.operation.identity
+        return self.operation.inverse(self.prefix(right), self.prefix(left - 1))
+
+    def _vector_nodes(self):
+        """int64 nodes as a zero-copy ndarray, or None when NumPy cannot be used safely"""
+        n = len(self.bit_array) - 1
+        if np is None or self.storage != 'int64' or not n:
+            return None
+        nodes = np.frombuffer(self.bit_array, dtype=np.int64)
+        # Values and prefixes combine at most log n + 1 nodes; past int64 they would wrap
+        largest = max(abs(int(nodes.min())), abs(int(nodes.max())))
+        if largest * (n.bit_length() + 1) >= 2 ** 63:
+            return None
+        return nodes
+
+    def to_array(self):
+        """Recover the current element values in O(n)"""
+        nodes = self._vector_nodes()
+        if nodes is not None:
+            return calculate_initial_array(nodes).tolist()
+        return calculate_initial_array(self.bit_array, self.operation)
+
+    def prefix_sums(self):
+        """All n prefix sums in O(n)"""
+        nodes = self._vector_nodes()
+        if nodes is not None:
+            return calculate_prefix_sums(nodes).tolist()
+        return calculate_prefix_sums(self.bit_array, self.operation)
+
+    def append(self, value):
+        """Add a new element at the end in O(log n)"""
+        self._detach()
+        bit_array = self.bit_array
+        index = len(bit_array)
+
+        # The new node covers index - RSB + 1 .. index; sum the already stored part of it
+        covered_start = index - (index & -index)
+        node = value
+        child = index - 1
+        if self.operation is SUM:
+            while child > covered_start:
+                node += bit_array[child]
+                child -= child & -child
+        else:
+            combine = self.operation.combine
+            while child > covered_start:
+                node = combine(node, bit_array[child])
+                child -= child & -child
+
+        try:
+            bit_array.append(node)
+        except (OverflowError, TypeError, ValueError):
+            if not self._promotable():
+                raise
+            self._promote()
+            self.bit_array.append(node)
+
+    def extend(self, values):
+        """Append every value from an iterable, consuming it lazily"""
+        for value in values:
+            self.append(value)
+
+    def shrink(self, count):
+        """Remove the last count elements in O(count)"""
+        n = len(self.bit_array) - 1
+        if not 0 <= count <= n:
+            raise ValueError(f"Cannot remove {count} of {n} elements")
+        self._detach()
+        if self._snapshots:
+            self._preserve(range((n - count + 1) // CHUNK_SIZE, n // CHUNK_SIZE + 1))
+        # Node i only covers positions up to i, so the remaining nodes stay valid
+        del self.bit_array[n - count + 1:]
+
+    def resize(self, size, fill=0):
+        """Grow with fill values or shrink from the end to exactly size elements"""
+        n = len(self.bit_array) - 1
+        if size < n:
+            self.shrink(n - size)
+        else:
+            # Each new node is summed from stored children in O(log n); the underlying
+            # list or array over-allocates geometrically, so growth is amortized
+            self.extend(fill for _ in range(size - n))
+
+    def apply_updates(self, indices, deltas):
+        """Apply a batch of point updates, rebuilding when that is cheaper"""
+        n = len(self.bit_array) - 1
+        indices = list(indices)
+        deltas = list(deltas)
+        if len(indices) != len(deltas):
+            raise ValueError("indices and deltas must have the same length")
+
+        # Merge duplicate indices so each node is touched once
+        combine = self.operation.combine
+        merged = {}
+        for index, delta in zip(indices, deltas):
+            if not 1 <= index <= n:
+                raise IndexError(f"Index {index} out of range 1..{n}")
+            merged[index] = combine(merged[index], delta) if index in merged else delta
+
+        self.stats['batch_updates'] += 1
+        self.stats['batch_duplicates_merged'] += len(indices) - len(merged)
+        if not merged:
+            return 'point'
+
+        if isinstance(self.bit_array, memoryview):
+            if self._snapshots:
+                for index in merged:
+                    self._preserve_path(index, n)
+            self._add_adopted(merged, n)
+            self.stats['batch_point_strategy'] += 1
+            return 'point'
+
+        if len(merged) * n.bit_length() > n * REBUILD_FACTOR:
+            if self._snapshots:
+                self._preserve(range(n // CHUNK_SIZE + 1))
+            # The transform is linear, so the BIT of the deltas can be combined node by node
+            delta_array = [self.operation.identity] * n
+            for index, delta in merged.items():
+                delta_array[index - 1] = delta
+            delta_bit = calculate_bit_array(delta_array, self.operation)
+            bit_array = self.bit_array
+            if self.operation is SUM:
+                i = 1
+                try:
+                    while i <= n:
+                        bit_array[i] += delta_bit[i]
+                        i += 1
+                except (OverflowError, TypeError, ValueError):
+                    if not self._promotable():
+                        raise
+                    self._promote()
+                    bit_array = self.bit_array
+                    for i in range(i, n + 1):
+                        bit_array[i] += delta_bit[i]
+            else:
+                for i in range(1, n + 1):
+                    bit_array[i] = combine(bit_array[i], delta_bit[i])
+            self.stats['batch_rebuild_strategy'] += 1
+            return 'rebuild'
+
+        if self._snapshots:
+            for index in merged:
+                self._preserve_path(index, n)
+        if self.operation is SUM:
+            for index, delta in merged.items():
+                self._add_sum(index, delta, n)
+        else:
+            bit_array = self.bit_array
+            for index, delta in merged.items():
+                while index <= n:
+                    bit_array[index] = combine(bit_array[index], delta)
+                    index += index & -index
+        self.stats['batch_point_strategy'] += 1
+        return 'point'
+
+
+def iter_stream_values(source, parse=int):
+    """Yield values from an iterable of numbers or of text chunks such as file lines"""
+    for item in source:
+        if isinstance(item, str):
+            for token in STREAM_SEPARATORS.split(item):
+                if token:
+                    yield parse(token)
+        else:
+            yield item
+
+
+def stream_build(source, tree=None, chunk_size=1024, parse=int):
+    """Grow a tree from a stream, yielding it after every chunk so it can be queried"""
+    if tree is None:
+        tree = FenwickTree()
+
+    pending = 0
+    for value in iter_stream_values(source, parse):
+        tree.append(value)
+        pending += 1
+        if pending == chunk_size:
+            pending = 0
+            yield tree
+
+    if pending:
+        yield tree
@@ -1,9 +1,11 @@
 import json
 from tkinter import filedialog, messagebox
 from ..utils.constants import JSON_FILETYPES
+from .bit_operations import calculate_bit_array, calculate_initial_array
+from .operations import OPERATIONS
 
 
-def save_state(initial_array, bit_array, current_step):
+def save_state(initial_array, current_step, operation='sum'):
     """Save complete diagram state to a file"""
     try:
         filename = filedialog.asksaveasfilename(
@@ -13,10 +15,11 @@ def save_state(initial_array, bit_array, current_step):
         if not filename:
             return None
 
+        # bit_array is derived from initial_array on load, so it is not stored
         state = {
             'initial_array': initial_array,
-            'bit_array': bit_array,
-            'current_step': current_step
+            'current_step': current_step,
+            'operation': operation
         }
 
         with open(filename, 'w') as f:
@@ -42,6 +45,14 @@ def load_state():
         with open(filename, 'r') as f:
             state = json.load(f)
 
+        # Files may store either array; the other is recovered in O(n)
+        state.setdefault('operation', 'sum')
+        operation = OPERATIONS[state['operation']]
+        if 'initial_array' not in state:
+            state['initial_array'] = calculate_initial_array(state['bit_array'], operation)
+        if 'bit_array' not in state:
+            state['bit_array'] = calculate_bit_array(state['initial_array'], operation)
+
         return state
 
     except Exception as e:
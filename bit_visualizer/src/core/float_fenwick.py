@@ -0,0 +1,104 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _neumaier_add(total, compensation, value):
+    """Add value to a (total, compensation) pair, returning the new pair"""
+    new_total = total + value
+    if abs(total) >= abs(value):
+        compensation += (total - new_total) + value
+    else:
+        compensation += (value - new_total) + total
+    return new_total, compensation
+
+
+class FloatFenwickTree:
+    """float64 Fenwick tree whose nodes carry Neumaier compensation terms"""
+
+    def __init__(self, initial_array=()):
+        values = [float(value) for value in initial_array]
+        n = len(values)
+
+        # Each node stores its sum and the rounding error lost while forming it
+        if np is not None and n:
+            self.bit_array, self.compensation = _build_vectorized(values)
+        else:
+            self.bit_array = array('d', [0.0]) + array('d', values)
+            self.compensation = array('d', bytes(8 * (n + 1)))
+            bit_array = self.bit_array
+            compensation = self.compensation
+            for i in range(1, n + 1):
+                parent = i + (i & -i)
+                if parent <= n:
+                    bit_array[parent], compensation[parent] = _neumaier_add(
+                        bit_array[parent], compensation[parent] + compensation[i], bit_array[i])
+
+    def __len__(self):
+        return len(self.bit_array) - 1
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index"""
+        n = len(self.bit_array) - 1
+        if not 1 <= index <= n:
+            raise IndexError(f"Index {index} out of range 1..{n}")
+
+        delta = float(delta)
+        bit_array = self.bit_array
+        compensation = self.compensation
+        while index <= n:
+            bit_array[index], compensation[index] = _neumaier_add(
+                bit_array[index], compensation[index], delta)
+            index += index & -index
+
+    def prefix(self, index):
+        """Compensated sum of values at positions 1..index"""
+        n = len(self.bit_array) - 1
+        if not 0 <= index <= n:
+            raise IndexError(f"Index {index} out of range 0..{n}")
+
+        bit_array = self.bit_array
+        compensation = self.compensation
+        total = 0.0
+        error = 0.0
+        while index > 0:
+            total, error = _neumaier_add(total, error + compensation[index], bit_array[index])
+            index -= index & -index
+        return total + error
+
+    def range_sum(self, left, right):
+        """Compensated sum of values at positions left..right inclusive"""
+        if left > right:
+            return 0.0
+        return self.prefix(right) - self.prefix(left - 1)
+
+
+def _build_vectorized(values):
+    """Build node sums and compensation terms one RSB level at a time with NumPy"""
+    n = len(values)
+    bit_array = np.zeros(n + 1)
+    bit_array[1:] = values
+    compensation = np.zeros(n + 1)
+
+    # Nodes of one level have distinct parents, and a level's parents are only
+    # finalized after every lower level has been folded into them
+    rsb = 1
+    while rsb <= n:
+        nodes = np.arange(rsb, n + 1, 2 * rsb)
+        nodes = nodes[nodes + rsb <= n]
+        parents = nodes + rsb
+
+        total = bit_array[parents]
+        value = bit_array[nodes]
+        new_total = total + value
+        error = np.where(np.abs(total) >= np.abs(value),
+                         (total - new_total) + value,
+                         (value - new_total) + total)
+        bit_array[parents] = new_total
+        compensation[parents] += compensation[nodes] + error
+        rsb *= 2
+
+    return array('d', bit_array.tobytes()), array('d', compensation.tobytes())
@@ -0,0 +1,117 @@
+from .bit_operations import calculate_bit_array
+from .operations import MIN, MAX
+
+
+def range_query_nodes(n, left, right):
+    """Nodes a two-tree range query reads, as ('bit' | 'mirror' | 'value', index) pairs"""
+    if not 1 <= left <= right <= n:
+        raise IndexError(f"Range {left}..{right} out of range 1..{n}")
+
+    # Climb the mirrored tree from the left end and the usual tree from the right end
+    nodes = []
+    i = left
+    while i + (i & -i) - 1 <= right:
+        nodes.append(('mirror', i))
+        i += i & -i
+
+    j = right
+    while j - (j & -j) + 1 >= i:
+        nodes.append(('bit', j))
+        j -= j & -j
+
+    # The two climbs meet at a single position neither tree covers on its own
+    if i <= j:
+        nodes.append(('value', i))
+    return nodes
+
+
+class MinMaxFenwickTree:
+    """Fenwick tree pair answering arbitrary range min/max queries with point assignment"""
+
+    def __init__(self, initial_array=(), operation=MIN):
+        if operation not in (MIN, MAX):
+            raise ValueError("MinMaxFenwickTree supports only the min and max operations")
+        self.operation = operation
+        self.values = [operation.identity] + list(initial_array)
+        n = len(self.values) - 1
+
+        # bit_array node i covers i - RSB(i) + 1 .. i; mirror_array node i covers i .. i + RSB(i) - 1.
+        # Both are built in O(n): the usual one bottom-up, the mirror top-down
+        self.bit_array = calculate_bit_array(self.values[1:], operation)
+        combine = operation.combine
+        mirror_array = list(self.values)
+        for i in range(n, 0, -1):
+            parent = i - (i & -i)
+            if parent >= 1:
+                mirror_array[parent] = combine(mirror_array[parent], mirror_array[i])
+        self.mirror_array = mirror_array
+
+    def __len__(self):
+        return len(self.values) - 1
+
+    def update(self, index, value):
+        """Assign value at 1-based index, recomputing affected nodes in O(log^2 n)"""
+        n = len(self.values) - 1
+        if not 1 <= index <= n:
+            raise IndexError(f"Index {index} out of range 1..{n}")
+
+        combine = self.operation.combine
+        values = self.values
+        values[index] = value
+
+        bit_array = self.bit_array
+        node = index
+        while node <= n:
+            total = values[node]
+            child = node - 1
+            start = node - (node & -node)
+            while child > start:
+                total = combine(total, bit_array[child])
+                child -= child & -child
+            bit_array[node] = total
+            node += node & -node
+
+        mirror_array = self.mirror_array
+        node = index
+        while node >= 1:
+            total = values[node]
+            child = node + 1
+            end = min(n, node + (node & -node) - 1)
+            while child <= end:
+                total = combine(total, mirror_array[child])
+                child += child & -child
+            mirror_array[node] = total
+            node -= node & -node
+
+    def prefix(self, index):
+        """Minimum or maximum of positions 1..index"""
+        n = len(self.values) - 1
+        if not 0 <= index <= n:
+            raise IndexError(f"Index {index} out of range 0..{n}")
+
+        combine = self.operation.combine
+        total = self.operation.identity
+        while index > 0:
+            total = combine(total, self.bit_array[index])
+            index -= index & -index
+        return total
+
+    def contributing_nodes(self, left, right):
+        """Nodes read by query(left, right)"""
+        return range_query_nodes(len(self.values) - 1, left, right)
+
+    def query(self, left, right):
+        """Minimum or maximum of positions left..right inclusive in O(log n)"""
+        if left > right:
+            return self.operation.identity
+
+        combine = self.operation.combine
+        arrays = {'bit': self.bit_array, 'mirror': self.mirror_array, 'value': self.values}
+        total = self.operation.identity
+        for kind, index in self.contributing_nodes(left, right):
+            total = combine(total, arrays[kind][index])
+        return total
+
+    def query_many(self, ranges):
+        """Answer a batch of (left, right) range queries"""
+        return [self.query(left, right) for left, right in ranges]
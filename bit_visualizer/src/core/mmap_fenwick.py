@@ -0,0 +1,132 @@
+import mmap
+import os
+import struct
+
+# File layout: magic, node count, then n + 1 native-order int64 nodes (node 0 unused)
+MMAP_MAGIC = b'BITMMAP1'
+MMAP_HEADER = struct.Struct('<8sQ')
+NODE_SIZE = 8
+
+
+class MmapFenwickTree:
+    """Dense Fenwick tree whose nodes live in a memory-mapped binary file"""
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self._file = open(path, 'rb' if readonly else 'r+b')
+        try:
+            access = mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+        except Exception:
+            self._file.close()
+            raise
+
+        magic, n = MMAP_HEADER.unpack_from(self._mmap, 0)
+        if magic != MMAP_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a memory-mapped BIT file")
+
+        self.n = n
+        self._views = [memoryview(self._mmap)]
+        self._views.append(self._views[0][MMAP_HEADER.size:])
+        self.bit_array = self._views[1].cast('q')
+
+    @classmethod
+    def create(cls, path, initial_array):
+        """Write a new tree file built from initial_array and open it"""
+        n = len(initial_array)
+        with open(path, 'wb') as f:
+            f.write(MMAP_HEADER.pack(MMAP_MAGIC, n))
+            f.truncate(mmap_file_size(n))
+
+        tree = cls(path)
+        bit_array = tree.bit_array
+
+        # Same recurrence as calculate_bit_array, run directly on the mapping
+        try:
+            for i, value in enumerate(initial_array, start=1):
+                bit_array[i] = value
+            for i in range(1, n + 1):
+                parent = i + (i & -i)
+                if parent <= n:
+                    bit_array[parent] += bit_array[i]
+        except Exception:
+            # A value or node past int64 would leave a half-built file behind
+            tree.close()
+            os.remove(path)
+            raise
+        return tree
+
+    def __len__(self):
+        return self.n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index"""
+        n = self.n
+        if not 1 <= index <= n:
+            raise IndexError(f"Index {index} out of range 1..{n}")
+
+        # Check the whole path first so an overflow cannot leave a half-applied update on disk
+        bit_array = self.bit_array
+        path = []
+        while index <= n:
+            value = bit_array[index] + delta
+            if not -2 ** 63 <= value < 2 ** 63:
+                raise OverflowError(f"Node {index} would overflow int64")
+            path.append((index, value))
+            index += index & -index
+
+        for index, value in path:
+            bit_array[index] = value
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        n = self.n
+        if not 0 <= index <= n:
+            raise IndexError(f"Index {index} out of range 0..{n}")
+
+        bit_array = self.bit_array
+        total = 0
+        while index > 0:
+            total += bit_array[index]
+            index -= index & -index
+        return total
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        if left > right:
+            return 0
+        return self.prefix(right) - self.prefix(left - 1)
+
+    def flush(self):
+        """Write dirty pages back to the file"""
+        if not self.readonly:
+            self._mmap.flush()
+
+    def close(self):
+        """Flush and release the mapping"""
+        if self._mmap is None:
+            return
+        self.flush()
+        # Every exported view must be released before the mapping can close
+        if getattr(self, 'bit_array', None) is not None:
+            self.bit_array.release()
+            self.bit_array = None
+            for view in reversed(self._views):
+                view.release()
+            self._views = []
+        self._mmap.close()
+        self._mmap = None
+        self._file.close()
+
+
+def mmap_file_size(n):
+    """Size in bytes of a memory-mapped BIT file holding n elements"""
+    return MMAP_HEADER.size + (n + 1) * NODE_SIZE
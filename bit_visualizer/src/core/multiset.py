@@ -0,0 +1,115 @@
+from bisect import bisect_left
+
+from .fenwick import FenwickTree
+
+
+class FenwickMultiset:
+    """Multiset of bounded integer keys with rank and k-th smallest queries"""
+
+    def __init__(self, max_key=None, keys=None):
+        # Keys are 0..max_key, or any of the given keys after offline compression
+        if keys is not None:
+            self.keys = sorted(set(keys))
+            size = len(self.keys)
+        elif max_key is not None and max_key >= 0:
+            self.keys = None
+            size = max_key + 1
+        else:
+            raise ValueError("Either a non-negative max_key or keys must be given")
+
+        self.counts = FenwickTree([0] * size)
+        self.size = 0
+        # Highest power of two not above the slot count, where binary lifting starts
+        self._top = 1 << (size.bit_length() - 1) if size else 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        return self.count(key) > 0
+
+    def _slot(self, key):
+        """1-based tree slot of a key"""
+        if self.keys is None:
+            if not 0 <= key < len(self.counts):
+                raise KeyError(f"Key {key} out of range 0..{len(self.counts) - 1}")
+            return key + 1
+
+        position = bisect_left(self.keys, key)
+        if position == len(self.keys) or self.keys[position] != key:
+            raise KeyError(f"Key {key} was not among the compressed keys")
+        return position + 1
+
+    def _key(self, slot):
+        return slot - 1 if self.keys is None else self.keys[slot - 1]
+
+    def insert(self, key, count=1):
+        """Add count copies of key"""
+        self.counts.update(self._slot(key), count)
+        self.size += count
+
+    def remove(self, key, count=1):
+        """Remove count copies of key"""
+        slot = self._slot(key)
+        if self.counts.range_sum(slot, slot) < count:
+            raise KeyError(f"Key {key} occurs fewer than {count} times")
+        self.counts.update(slot, -count)
+        self.size -= count
+
+    def count(self, key):
+        """Number of copies of key"""
+        try:
+            slot = self._slot(key)
+        except KeyError:
+            return 0
+        return self.counts.range_sum(slot, slot)
+
+    def count_less(self, key):
+        """Number of elements strictly smaller than key"""
+        if self.keys is None:
+            slots = min(max(key, 0), len(self.counts))
+        else:
+            slots = bisect_left(self.keys, key)
+        return self.counts.prefix(slots)
+
+    def rank(self, key):
+        """1-based position of the first copy of key in sorted order"""
+        return self.count_less(key) + 1
+
+    def kth(self, k):
+        """k-th smallest element, 1-based, found by binary lifting in O(log n)"""
+        if not 1 <= k <= self.size:
+            raise IndexError(f"k={k} out of range 1..{self.size}")
+
+        bit_array = self.counts.bit_array
+        n = len(bit_array) - 1
+        slot = 0
+        step = self._top
+        while step:
+            if slot + step <= n and bit_array[slot + step] < k:
+                slot += step
+                k -= bit_array[slot]
+            step >>= 1
+        return self._key(slot + 1)
+
+    def insert_many(self, keys):
+        """Insert a batch of keys, merging duplicates into one update per key"""
+        slots = [self._slot(key) for key in keys]
+        self.counts.apply_updates(slots, [1] * len(slots))
+        self.size += len(slots)
+
+    def remove_many(self, keys):
+        """Remove a batch of keys"""
+        wanted = {}
+        for key in keys:
+            slot = self._slot(key)
+            wanted[slot] = wanted.get(slot, 0) + 1
+        for slot, count in wanted.items():
+            if self.counts.range_sum(slot, slot) < count:
+                raise KeyError(f"Key {self._key(slot)} occurs fewer than {count} times")
+        self.counts.apply_updates(list(wanted), [-count for count in wanted.values()])
+        self.size -= sum(wanted.values())
+
+    def kth_many(self, ks):
+        """k-th smallest element for each k in a batch"""
+        return [self.kth(k) for k in ks]
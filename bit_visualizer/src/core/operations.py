@@ -0,0 +1,40 @@
+import operator
+from collections import namedtuple
+
+# combine must be associative with identity as its neutral element.
+# inverse(total, part) removes part from total; it is None when the operation has no inverse,
+# in which case only prefix queries are available and updates must be combined in (e.g. max only grows).
+Operation = namedtuple('Operation', ['name', 'symbol', 'combine', 'identity', 'inverse'])
+
+SUM = Operation('sum', '+', operator.add, 0, operator.sub)
+XOR = Operation('xor', '^', operator.xor, 0, operator.xor)
+MAX = Operation('max', 'max', max, float('-inf'), None)
+MIN = Operation('min', 'min', min, float('inf'), None)
+PRODUCT = Operation('product', '×', operator.mul, 1, None)
+
+
+def modular_sum(modulus):
+    """Sum modulo modulus, with subtraction as the inverse"""
+    return Operation(
+        f'sum mod {modulus}', '+',
+        lambda a, b: (a + b) % modulus,
+        0,
+        lambda a, b: (a - b) % modulus
+    )
+
+
+def modular_product(modulus):
+    """Product modulo a prime, with division by the modular inverse"""
+    return Operation(
+        f'product mod {modulus}', '×',
+        lambda a, b: a * b % modulus,
+        1,
+        lambda a, b: a * pow(b, -1, modulus) % modulus
+    )
+
+
+# Operations selectable from the visualizer, keyed by display name
+OPERATIONS = {
+    operation.name: operation
+    for operation in (SUM, XOR, MIN, MAX, PRODUCT, modular_sum(1_000_000_007))
+}
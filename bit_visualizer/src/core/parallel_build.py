@@ -0,0 +1,102 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .bit_operations import calculate_bit_array, np
+
+# Nodes are int64; inputs whose node sums could overflow are built by calculate_bit_array
+NODE_SIZE = 8
+# Blocks handed out per worker, so uneven scheduling still keeps every worker busy
+BLOCKS_PER_WORKER = 4
+
+
+def _build_block(name, n, start, stop):
+    """Turn values start + 1..stop of the shared array into BIT nodes local to their block"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        if np is not None:
+            nodes = np.ndarray((n + 1,), dtype=np.int64, buffer=shm.buf)
+            # Node j covers j - RSB(j) + 1..j within the block, a difference of two cumsums
+            cumulative = np.zeros(stop - start + 1, dtype=np.int64)
+            np.cumsum(nodes[start + 1:stop + 1], out=cumulative[1:])
+            local = np.arange(1, stop - start + 1)
+            nodes[start + 1:stop + 1] = cumulative[local] - cumulative[local - (local & -local)]
+            del nodes
+        else:
+            slots = shm.buf.cast('q')
+            for i in range(start + 1, stop + 1):
+                parent = i + ((i - start) & -(i - start))
+                if parent <= stop:
+                    slots[parent] += slots[i]
+            slots.release()
+    finally:
+        shm.close()
+
+
+def _node_sums_fit(initial_array, n):
+    """Whether every node sum is bounded within int64 by n times the largest magnitude"""
+    if np is not None:
+        values = np.asarray(initial_array)
+        if values.dtype.kind in 'iub':
+            if not values.size:
+                return True
+            largest = max(abs(int(values.min())), abs(int(values.max())))
+            return largest * n < 2 ** 63
+        if values.dtype != object:
+            return False
+
+    if not all(isinstance(value, int) for value in initial_array):
+        return False
+    return max(map(abs, initial_array), default=0) * n < 2 ** 63
+
+
+def calculate_bit_array_parallel(initial_array, workers=None, block_size=None):
+    """Build a BIT array from aligned power-of-two blocks on a process pool
+
+    Returns an int64 array('q') like FenwickTree's typed storage. Values that are not
+    integers, or whose node sums could pass int64, instead return the Python int list
+    of calculate_bit_array, the same fallback FenwickTree makes on promotion.
+    """
+    n = len(initial_array)
+    # NumPy cumsums wrap silently, so anything that might not fit takes the exact serial build
+    if not _node_sums_fit(initial_array, n):
+        return calculate_bit_array(list(initial_array))
+
+    workers = workers or os.cpu_count() or 1
+    if block_size is None:
+        target = max(1, -(-n // (workers * BLOCKS_PER_WORKER)))
+        block_size = 1 << (target - 1).bit_length()
+    elif block_size & (block_size - 1):
+        raise ValueError("block_size must be a power of two")
+
+    shm = shared_memory.SharedMemory(create=True, size=(n + 1) * NODE_SIZE)
+    slots = shm.buf.cast('q')
+    try:
+        slots[0] = 0
+        if np is not None:
+            np.ndarray((n + 1,), dtype=np.int64, buffer=shm.buf)[1:] = initial_array
+        else:
+            slots[1:] = initial_array if isinstance(initial_array, array) else array('q', initial_array)
+
+        # Every node inside an aligned block only feeds parents in the same block,
+        # except the block's last node, whose parents are fixed up below
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_build_block, shm.name, n, start, min(start + block_size, n))
+                       for start in range(0, n, block_size)]
+            for future in futures:
+                future.result()
+
+        # Node k * B covers blocks k - RSB(k) + 1..k, so the block-end nodes are
+        # exactly the BIT of the full block totals
+        ends = range(block_size, n + 1, block_size)
+        top = calculate_bit_array([slots[end] for end in ends])
+        for k, end in enumerate(ends, start=1):
+            slots[end] = top[k]
+
+        return array('q', slots)
+    finally:
+        # An exported view left open would make close() raise and hide the real error
+        slots.release()
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,76 @@
+from bisect import bisect_right
+
+from .bit_operations import calculate_bit_array
+from .operations import SUM
+
+
+class PersistentFenwickTree:
+    """Fat-node Fenwick tree that answers queries at any past version"""
+
+    def __init__(self, initial_array=(), operation=None):
+        self.operation = operation or SUM
+        bit_array = calculate_bit_array(list(initial_array), self.operation)
+
+        # Node i keeps the versions at which it changed and its value from each of them on
+        self._node_versions = [[0] for _ in bit_array]
+        self._node_values = [[value] for value in bit_array]
+        self.version = 0
+
+    def __len__(self):
+        return len(self._node_values) - 1
+
+    def _check_version(self, version):
+        if version is None:
+            return self.version
+        if not 0 <= version <= self.version:
+            raise ValueError(f"Version {version} out of range 0..{self.version}")
+        return version
+
+    def node_value(self, index, version=None):
+        """Value of node index as of version (latest by default)"""
+        version = self._check_version(version)
+        position = bisect_right(self._node_versions[index], version) - 1
+        return self._node_values[index][position]
+
+    def update(self, index, delta):
+        """Combine delta into the value at 1-based index, creating and returning a new version"""
+        n = len(self)
+        if not 1 <= index <= n:
+            raise IndexError(f"Index {index} out of range 1..{n}")
+
+        # Each update appends one entry to the O(log n) nodes on its path
+        self.version += 1
+        combine = self.operation.combine
+        while index <= n:
+            self._node_versions[index].append(self.version)
+            self._node_values[index].append(combine(self._node_values[index][-1], delta))
+            index += index & -index
+        return self.version
+
+    def prefix(self, index, version=None):
+        """Prefix aggregate of positions 1..index as of version"""
+        n = len(self)
+        if not 0 <= index <= n:
+            raise IndexError(f"Index {index} out of range 0..{n}")
+        version = self._check_version(version)
+
+        combine = self.operation.combine
+        total = self.operation.identity
+        while index > 0:
+            total = combine(total, self.node_value(index, version))
+            index -= index & -index
+        return total
+
+    def range_sum(self, left, right, version=None):
+        """Aggregate of positions left..right inclusive as of version"""
+        if self.operation.inverse is None:
+            raise ValueError(f"Operation '{self.operation.name}' has no inverse for range queries")
+        if left > right:
+            return self.operation.identity
+        return self.operation.inverse(self.prefix(right, version), self.prefix(left - 1, version))
+
+    def bit_array(self, version=None):
+        """Snapshot of every node as of version"""
+        version = self._check_version(version)
+        return [self.node_value(i, version) for i in range(len(self._node_values))]
+
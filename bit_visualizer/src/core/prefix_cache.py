@@ -0,0 +1,85 @@
+import time
+
+from .operations import SUM
+
+# A single pending update is patched into the cached prefixes when it touches
+# at most this fraction of them; otherwise the cache is dropped and rebuilt lazily
+PATCH_FRACTION = 0.5
+
+
+class PrefixCache:
+    """Serves prefix queries from a flat prefix array materialized after each change"""
+
+    def __init__(self, tree):
+        if getattr(tree, 'operation', SUM) is not SUM:
+            raise ValueError("PrefixCache only supports sum trees")
+        self.tree = tree
+        self._prefix_sums = None
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'rebuilds': 0,
+            'rebuild_seconds': 0.0,
+            'patches': 0,
+            'patched_entries': 0,
+            'invalidations': 0
+        }
+
+    def __len__(self):
+        return len(self.tree)
+
+    @property
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def _materialize(self):
+        start = time.perf_counter()
+        # The tree decides when its nodes can be summed vectorized without overflowing
+        self._prefix_sums = [0] + self.tree.prefix_sums()
+        self.stats['rebuilds'] += 1
+        self.stats['rebuild_seconds'] += time.perf_counter() - start
+
+    def update(self, index, delta):
+        """Update the tree, then patch the cached suffix or drop the cache"""
+        self.tree.update(index, delta)
+        prefix_sums = self._prefix_sums
+        if prefix_sums is None:
+            return
+
+        count = len(prefix_sums) - index
+        if count <= PATCH_FRACTION * len(prefix_sums):
+            for i in range(index, len(prefix_sums)):
+                prefix_sums[i] += delta
+            self.stats['patches'] += 1
+            self.stats['patched_entries'] += count
+        else:
+            self._prefix_sums = None
+            self.stats['invalidations'] += 1
+
+    def apply_updates(self, indices, deltas):
+        """Apply a batch of updates to the tree and drop the cache"""
+        result = self.tree.apply_updates(indices, deltas)
+        if self._prefix_sums is not None:
+            self._prefix_sums = None
+            self.stats['invalidations'] += 1
+        return result
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index in O(1) once materialized"""
+        if self._prefix_sums is None:
+            self.stats['misses'] += 1
+            self._materialize()
+        else:
+            self.stats['hits'] += 1
+
+        n = len(self._prefix_sums) - 1
+        if not 0 <= index <= n:
+            raise IndexError(f"Index {index} out of range 0..{n}")
+        return self._prefix_sums[index]
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        if left > right:
+            return 0
+        return self.prefix(right) - self.prefix(left - 1)
@@ -0,0 +1,73 @@
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from .operations import SUM
+
+
+class LRUPrefixCache:
+    """Bounded LRU memo of prefix results, invalidated only from the updated index up"""
+
+    def __init__(self, tree, capacity=1024):
+        if getattr(tree, 'operation', SUM) is not SUM:
+            raise ValueError("LRUPrefixCache only supports sum trees")
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.tree = tree
+        self.capacity = capacity
+        self._results = OrderedDict()
+        # Cached indices kept sorted so an update can cut off every index >= j at once
+        self._indices = []
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+
+    def __len__(self):
+        return len(self.tree)
+
+    def _invalidate_from(self, index):
+        position = bisect_left(self._indices, index)
+        stale = self._indices[position:]
+        for cached in stale:
+            del self._results[cached]
+        del self._indices[position:]
+        self.stats['invalidations'] += len(stale)
+
+    def update(self, index, delta):
+        """Update the tree and drop cached prefixes that include index"""
+        self.tree.update(index, delta)
+        self._invalidate_from(index)
+
+    def apply_updates(self, indices, deltas):
+        """Apply a batch of updates, dropping cached prefixes from the lowest index up"""
+        indices = list(indices)
+        result = self.tree.apply_updates(indices, deltas)
+        if indices:
+            self._invalidate_from(min(indices))
+        return result
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index, memoized"""
+        results = self._results
+        if index in results:
+            results.move_to_end(index)
+            self.stats['hits'] += 1
+            return results[index]
+
+        self.stats['misses'] += 1
+        value = self.tree.prefix(index)
+        results[index] = value
+        insort(self._indices, index)
+        if len(results) > self.capacity:
+            evicted, _ = results.popitem(last=False)
+            del self._indices[bisect_left(self._indices, evicted)]
+            self.stats['evictions'] += 1
+        return value
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        if left > right:
+            return 0
+        return self.prefix(right) - self.prefix(left - 1)
@@ -0,0 +1,51 @@
+from .fenwick import FenwickTree
+
+
+class RangeFenwickTree:
+    """Dual Fenwick tree supporting range addition and range sums in O(log n)"""
+
+    def __init__(self, initial_array=()):
+        values = list(initial_array)
+        self.n = len(values)
+
+        # prefix(i) = i * sum(diff[1..i]) - sum(diff[j] * (j - 1) for j in 1..i)
+        diff = [value - previous for previous, value in zip([0] + values, values)]
+        self.coefficients = FenwickTree(diff)
+        self.corrections = FenwickTree([d * j for j, d in enumerate(diff)])
+
+    def __len__(self):
+        return self.n
+
+    def range_add(self, left, right, delta):
+        """Add delta to every value at positions left..right inclusive"""
+        if not 1 <= left <= right <= self.n:
+            raise IndexError(f"Range {left}..{right} out of range 1..{self.n}")
+
+        self.coefficients.update(left, delta)
+        self.corrections.update(left, delta * (left - 1))
+        if right < self.n:
+            self.coefficients.update(right + 1, -delta)
+            self.corrections.update(right + 1, -delta * right)
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index"""
+        self.range_add(index, index, delta)
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        return self.coefficients.prefix(index) * index - self.corrections.prefix(index)
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        if left > right:
+            return 0
+        return self.prefix(right) - self.prefix(left - 1)
+
+    def to_array(self):
+        """Recover the current element values in O(n)"""
+        values = []
+        running = 0
+        for diff in self.coefficients.to_array():
+            running += diff
+            values.append(running)
+        return values
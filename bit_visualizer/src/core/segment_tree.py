@@ -0,0 +1,108 @@
+class SegmentTree:
+    """Iterative array-backed segment tree with lazy range addition"""
+
+    def __init__(self, initial_array=()):
+        values = list(initial_array)
+        self.n = len(values)
+
+        # Padding to a power of two keeps every node's length equal to its level's width
+        self.height = max(1, (self.n - 1).bit_length()) if self.n else 1
+        self.size = 1 << self.height
+        tree = [0] * (2 * self.size)
+        tree[self.size:self.size + self.n] = values
+        for i in range(self.size - 1, 0, -1):
+            tree[i] = tree[2 * i] + tree[2 * i + 1]
+        self.tree = tree
+        self.lazy = [0] * self.size
+
+    def __len__(self):
+        return self.n
+
+    def _apply(self, node, value, length):
+        self.tree[node] += value * length
+        if node < self.size:
+            self.lazy[node] += value
+
+    def _rebuild(self, node):
+        """Recompute the ancestors of a leaf from their children and pending adds"""
+        length = 2
+        node >>= 1
+        while node >= 1:
+            self.tree[node] = self.tree[2 * node] + self.tree[2 * node + 1] + self.lazy[node] * length
+            node >>= 1
+            length <<= 1
+
+    def _push(self, node):
+        """Push pending adds down the path from the root to a leaf"""
+        for shift in range(self.height, 0, -1):
+            parent = node >> shift
+            pending = self.lazy[parent]
+            if pending:
+                length = 1 << (shift - 1)
+                self._apply(2 * parent, pending, length)
+                self._apply(2 * parent + 1, pending, length)
+                self.lazy[parent] = 0
+
+    def _check(self, left, right):
+        if not 1 <= left <= right <= self.n:
+            raise IndexError(f"Range {left}..{right} out of range 1..{self.n}")
+
+    def range_add(self, left, right, delta):
+        """Add delta to every value at positions left..right inclusive"""
+        self._check(left, right)
+        if not delta:
+            return
+
+        low = left - 1 + self.size
+        high = right - 1 + self.size
+        self._push(low)
+        self._push(high)
+
+        node_left, node_right, length = low, high + 1, 1
+        while node_left < node_right:
+            if node_left & 1:
+                self._apply(node_left, delta, length)
+                node_left += 1
+            if node_right & 1:
+                node_right -= 1
+                self._apply(node_right, delta, length)
+            node_left >>= 1
+            node_right >>= 1
+            length <<= 1
+
+        self._rebuild(low)
+        self._rebuild(high)
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index"""
+        self.range_add(index, index, delta)
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        if left > right:
+            return 0
+        self._check(left, right)
+
+        low = left - 1 + self.size
+        high = right - 1 + self.size
+        self._push(low)
+        self._push(high)
+
+        total = 0
+        node_left, node_right = low, high + 1
+        while node_left < node_right:
+            if node_left & 1:
+                total += self.tree[node_left]
+                node_left += 1
+            if node_right & 1:
+                node_right -= 1
+                total += self.tree[node_right]
+            node_left >>= 1
+            node_right >>= 1
+        return total
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        if not 0 <= index <= self.n:
+            raise IndexError(f"Index {index} out of range 0..{self.n}")
+        return self.range_sum(1, index) if index else 0
@@ -0,0 +1,238 @@
+import multiprocessing
+import os
+from array import array
+from bisect import bisect_right
+from multiprocessing import shared_memory
+
+from .fenwick import FenwickTree
+
+# Values, deltas and local prefixes cross process boundaries as int64 slots
+NODE_SIZE = 8
+# Operations staged in the shared index/value buffers per scatter round
+DEFAULT_BATCH_CAPACITY = 1 << 16
+
+
+def _shard_worker(conn, values_name, start, stop, index_name, value_name):
+    """Hold the local tree of one segment and serve commands over shared buffers"""
+    values = shared_memory.SharedMemory(name=values_name)
+    view = values.buf.cast('q')
+    tree = FenwickTree(view[start:stop])
+    view.release()
+    values.close()
+    conn.send('ready')
+
+    index_shm = shared_memory.SharedMemory(name=index_name)
+    value_shm = shared_memory.SharedMemory(name=value_name)
+    indices = index_shm.buf.cast('q')
+    slots = value_shm.buf.cast('q')
+    try:
+        while True:
+            command, offset, count = conn.recv()
+            if command == 'stop':
+                break
+            end = offset + count
+            # Failures are replied rather than raised, so the worker survives and the
+            # coordinator still reads exactly one reply per command
+            try:
+                if command == 'update':
+                    tree.apply_updates(indices[offset:end], slots[offset:end])
+                elif command == 'prefix':
+                    prefix = tree.prefix
+                    for j in range(offset, end):
+                        value = prefix(indices[j])
+                        try:
+                            slots[j] = value
+                        except ValueError:
+                            raise OverflowError(f"Prefix {value} does not fit in int64") from None
+            except Exception as exc:
+                conn.send(exc)
+            else:
+                conn.send(count)
+    finally:
+        indices.release()
+        slots.release()
+        index_shm.close()
+        value_shm.close()
+        conn.close()
+
+
+class ShardedFenwickTree:
+    """Index range split across worker processes, each holding a local tree of its segment"""
+
+    # Deltas and local prefix sums are exchanged as int64; a query whose local prefix
+    # exceeds int64 raises OverflowError while the workers keep running
+
+    def __init__(self, initial_array=(), workers=None, batch_capacity=DEFAULT_BATCH_CAPACITY):
+        values = array('q', initial_array)
+        self.n = len(values)
+        shard_count = max(1, min(workers or os.cpu_count() or 1, self.n or 1))
+        self.batch_capacity = batch_capacity
+
+        # Shard s covers 1-based positions starts[s] + 1 .. starts[s + 1]
+        self.starts = [self.n * s // shard_count for s in range(shard_count + 1)]
+        # Coordinator tree over segment totals; prefix(i) = totals before i's shard + local prefix
+        self.coordinator = FenwickTree(
+            [sum(values[self.starts[s]:self.starts[s + 1]]) for s in range(shard_count)])
+
+        # Batches are scattered through two shared buffers: local indices, and deltas in
+        # or prefixes out; each shard works on its own contiguous region of them
+        self._index_shm = shared_memory.SharedMemory(create=True, size=batch_capacity * NODE_SIZE)
+        self._value_shm = shared_memory.SharedMemory(create=True, size=batch_capacity * NODE_SIZE)
+        self._indices = self._index_shm.buf.cast('q')
+        self._slots = self._value_shm.buf.cast('q')
+
+        values_shm = shared_memory.SharedMemory(create=True, size=max(1, self.n) * NODE_SIZE)
+        values_shm.buf[:self.n * NODE_SIZE] = values.tobytes()
+        self._connections = []
+        self._processes = []
+        try:
+            for s in range(shard_count):
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_shard_worker, daemon=True,
+                    args=(child, values_shm.name, self.starts[s], self.starts[s + 1],
+                          self._index_shm.name, self._value_shm.name))
+                process.start()
+                child.close()
+                self._connections.append(parent)
+                self._processes.append(process)
+            # Workers copy their segment while building, after which the values block can go
+            for connection in self._connections:
+                connection.recv()
+        finally:
+            values_shm.close()
+            values_shm.unlink()
+
+        self.stats = {
+            'shards': shard_count,
+            'scatter_rounds': 0,
+            'scattered_updates': 0,
+            'scattered_queries': 0
+        }
+
+    def __len__(self):
+        return self.n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _shard(self, index):
+        return bisect_right(self.starts, index - 1) - 1
+
+    def _scatter(self, command, items):
+        """Stage (global position, local index, value) items per shard and run them in parallel"""
+        results = [0] * len(items)
+        for first in range(0, len(items), self.batch_capacity):
+            chunk = items[first:first + self.batch_capacity]
+            by_shard = {}
+            for position, (shard, local, value) in enumerate(chunk, start=first):
+                by_shard.setdefault(shard, []).append((position, local, value))
+
+            # Pack every shard's values before signalling any, so a value outside int64
+            # fails the whole round before a shard has changed
+            staged = [(shard, array('q', [e[1] for e in entries]), array('q', [e[2] for e in entries]))
+                      for shard, entries in by_shard.items()]
+
+            offset = 0
+            regions = []
+            for (shard, local_indices, values), entries in zip(staged, by_shard.values()):
+                count = len(entries)
+                self._indices[offset:offset + count] = local_indices
+                self._slots[offset:offset + count] = values
+                self._connections[shard].send((command, offset, count))
+                regions.append((offset, entries))
+                offset += count
+
+            # Every shard is working by now; gather every reply before raising any failure
+            error = None
+            for (shard, _, _), (offset, entries) in zip(staged, regions):
+                reply = self._connections[shard].recv()
+                if isinstance(reply, Exception):
+                    error = error or reply
+                elif command == 'prefix':
+                    for j, (position, _, _) in enumerate(entries, start=offset):
+                        results[position] = self._slots[j]
+            self.stats['scatter_rounds'] += 1
+            if error is not None:
+                raise error
+        return results
+
+    def apply_updates(self, indices, deltas):
+        """Add each delta at its 1-based index, with shards applying their parts in parallel"""
+        indices = list(indices)
+        deltas = list(deltas)
+        if len(indices) != len(deltas):
+            raise ValueError("indices and deltas must have the same length")
+
+        items = []
+        shard_totals = {}
+        for index, delta in zip(indices, deltas):
+            if not 1 <= index <= self.n:
+                raise IndexError(f"Index {index} out of range 1..{self.n}")
+            if not -2 ** 63 <= delta < 2 ** 63:
+                raise OverflowError(f"Delta {delta} does not fit in int64")
+            shard = self._shard(index)
+            items.append((shard, index - self.starts[shard], delta))
+            shard_totals[shard] = shard_totals.get(shard, 0) + delta
+
+        self._scatter('update', items)
+        self.coordinator.apply_updates([shard + 1 for shard in shard_totals],
+                                       list(shard_totals.values()))
+        self.stats['scattered_updates'] += len(items)
+
+    def prefix_many(self, indices):
+        """Prefix sums for a batch of indices, with shards answering in parallel"""
+        items = []
+        bases = []
+        for index in indices:
+            if not 0 <= index <= self.n:
+                raise IndexError(f"Index {index} out of range 0..{self.n}")
+            if index == 0:
+                # Position 0 is the empty prefix; shard 0 answers its local index 0 as 0
+                shard = 0
+            else:
+                shard = self._shard(index)
+            items.append((shard, index - self.starts[shard], 0))
+            bases.append(self.coordinator.prefix(shard))
+
+        local = self._scatter('prefix', items)
+        self.stats['scattered_queries'] += len(items)
+        return [base + value for base, value in zip(bases, local)]
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index"""
+        self.apply_updates([index], [delta])
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        return self.prefix_many([index])[0]
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive"""
+        if left > right:
+            return 0
+        high, low = self.prefix_many([right, left - 1])
+        return high - low
+
+    def close(self):
+        """Stop the workers and release the shared buffers"""
+        if self._indices is None:
+            return
+        for connection in self._connections:
+            try:
+                connection.send(('stop', 0, 0))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join()
+        for connection in self._connections:
+            connection.close()
+        self._indices.release()
+        self._slots.release()
+        self._indices = self._slots = None
+        for shm in (self._index_shm, self._value_shm):
+            shm.close()
+            shm.unlink()
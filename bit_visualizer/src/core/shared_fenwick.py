@@ -0,0 +1,154 @@
+from multiprocessing import shared_memory
+
+# Slots before the nodes: seqlock version, element count
+VERSION_SLOT = 0
+SIZE_SLOT = 1
+HEADER_SLOTS = 2
+NODE_SIZE = 8
+
+
+class SharedFenwickTree:
+    """Fenwick tree in shared memory with one writer and many lock-free readers"""
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self._slots = shm.buf.cast('q')
+        self.n = self._slots[SIZE_SLOT]
+        self.stats = {
+            'point_updates': 0,
+            'read_retries': 0
+        }
+
+    @classmethod
+    def create(cls, initial_array, name=None):
+        """Allocate a shared block, build the tree in it and return the writer"""
+        n = len(initial_array)
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=(HEADER_SLOTS + n + 1) * NODE_SIZE)
+        tree = cls(shm, owner=True)
+        slots = tree._slots
+        slots[VERSION_SLOT] = 0
+        slots[SIZE_SLOT] = n
+        tree.n = n
+
+        # Same recurrence as calculate_bit_array, offset past the header
+        try:
+            for i, value in enumerate(initial_array, start=1):
+                slots[HEADER_SLOTS + i] = value
+            for i in range(1, n + 1):
+                parent = i + (i & -i)
+                if parent <= n:
+                    slots[HEADER_SLOTS + parent] += slots[HEADER_SLOTS + i]
+        except Exception:
+            # close() releases the exported view before unlinking, so the segment cannot leak
+            tree.close()
+            raise
+        return tree
+
+    @classmethod
+    def attach(cls, name):
+        """Attach a zero-copy reader to an existing shared tree"""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    def __len__(self):
+        return self.n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def version(self):
+        """Seqlock counter; odd while a write is in progress"""
+        return self._slots[VERSION_SLOT]
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index (writer only)"""
+        if not self.owner:
+            raise PermissionError("Only the creating process may update a shared tree")
+        n = self.n
+        if not 1 <= index <= n:
+            raise IndexError(f"Index {index} out of range 1..{n}")
+
+        # Check the whole path first: a node failing mid-write would publish half an update
+        slots = self._slots
+        path = []
+        while index <= n:
+            value = slots[HEADER_SLOTS + index] + delta
+            if not -2 ** 63 <= value < 2 ** 63:
+                raise OverflowError(f"Node {index} would overflow int64")
+            path.append((HEADER_SLOTS + index, value))
+            index += index & -index
+
+        slots[VERSION_SLOT] += 1
+        try:
+            for slot, value in path:
+                slots[slot] = value
+        finally:
+            slots[VERSION_SLOT] += 1
+        self.stats['point_updates'] += 1
+
+    def _read(self, read):
+        """Run read until it completes without a concurrent write"""
+        slots = self._slots
+        while True:
+            before = slots[VERSION_SLOT]
+            if before & 1:
+                self.stats['read_retries'] += 1
+                continue
+            result = read(slots)
+            if slots[VERSION_SLOT] == before:
+                return result
+            self.stats['read_retries'] += 1
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        n = self.n
+        if not 0 <= index <= n:
+            raise IndexError(f"Index {index} out of range 0..{n}")
+
+        def read(slots):
+            position = index
+            total = 0
+            while position > 0:
+                total += slots[HEADER_SLOTS + position]
+                position -= position & -position
+            return total
+
+        return self._read(read)
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive, from one consistent version"""
+        if left > right:
+            return 0
+        n = self.n
+        if not 1 <= left or not right <= n:
+            raise IndexError(f"Range {left}..{right} out of range 1..{n}")
+
+        def read(slots):
+            total = 0
+            position = right
+            while position > 0:
+                total += slots[HEADER_SLOTS + position]
+                position -= position & -position
+            position = left - 1
+            while position > 0:
+                total -= slots[HEADER_SLOTS + position]
+                position -= position & -position
+            return total
+
+        return self._read(read)
+
+    def close(self):
+        """Detach from the shared block, unlinking it when this is the writer"""
+        if self._slots is None:
+            return
+        self._slots.release()
+        self._slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,67 @@
+from .fenwick import FenwickTree
+
+
+class SlidingWindowFenwick:
+    """Fenwick tree over a ring buffer holding the last capacity samples"""
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.tree = FenwickTree([0] * capacity)
+        self.slots = [0] * capacity
+        # Physical slot of the oldest sample, and how many slots are filled
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, value):
+        """Add a sample, overwriting the oldest one once the window is full"""
+        if self.count < self.capacity:
+            slot = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+
+        delta = value - self.slots[slot]
+        self.slots[slot] = value
+        if delta:
+            self.tree.update(slot + 1, delta)
+
+    def extend(self, values):
+        """Push every value from an iterable"""
+        for value in values:
+            self.push(value)
+
+    def ingest(self, batches):
+        """Push batches from a generator, yielding the window after each one"""
+        for batch in batches:
+            self.extend(batch)
+            yield self
+
+    def _physical_sum(self, first, last):
+        """Sum of physical slots first..last, 0-based inclusive"""
+        return self.tree.range_sum(first + 1, last + 1)
+
+    def range_sum(self, left, right):
+        """Sum of samples left..right, counted from 0 as the oldest in the window"""
+        if left > right:
+            return 0
+        if not 0 <= left <= right < self.count:
+            raise IndexError(f"Range {left}..{right} out of range 0..{self.count - 1}")
+
+        first = (self.start + left) % self.capacity
+        last = (self.start + right) % self.capacity
+        if first <= last:
+            return self._physical_sum(first, last)
+        # The range wraps around the end of the buffer
+        return self._physical_sum(first, self.capacity - 1) + self._physical_sum(0, last)
+
+    def window_sum(self, size=None):
+        """Sum of the newest size samples, or of the whole window"""
+        if size is None or size > self.count:
+            size = self.count
+        return self.range_sum(self.count - size, self.count - 1)
@@ -0,0 +1,76 @@
+from array import array
+
+from .bit_operations import calculate_initial_array
+from .operations import SUM
+
+# Nodes preserved together on the first write after a snapshot; 512 int64 nodes fill a 4 KiB page
+CHUNK_SIZE = 512
+
+
+def copy_chunk(bit_array, chunk):
+    """Copy the nodes of one chunk, detaching slices of adopted buffers"""
+    nodes = bit_array[chunk * CHUNK_SIZE:(chunk + 1) * CHUNK_SIZE]
+    return array('q', nodes) if isinstance(nodes, memoryview) else nodes
+
+
+class FenwickSnapshot:
+    """Read-only view of a FenwickTree as it was when the snapshot was taken"""
+
+    def __init__(self, tree, store, size):
+        self.tree = tree
+        self.operation = tree.operation
+        # Chunks the tree has overwritten since, keyed by chunk number; others are read live
+        self.store = store
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def _node(self, index):
+        saved = self.store.get(index // CHUNK_SIZE)
+        if saved is not None:
+            return saved[index % CHUNK_SIZE]
+        return self.tree.bit_array[index]
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index at snapshot time"""
+        if not 0 <= index <= self.size:
+            raise IndexError(f"Index {index} out of range 0..{self.size}")
+
+        combine = self.operation.combine
+        total = self.operation.identity
+        while index > 0:
+            total = combine(total, self._node(index))
+            index -= index & -index
+        return total
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive at snapshot time"""
+        if self.operation is SUM:
+            if left > right:
+                return 0
+            return self.prefix(right) - self.prefix(left - 1)
+
+        if self.operation.inverse is None:
+            raise ValueError(f"Operation '{self.operation.name}' has no inverse for range queries")
+        if left > right:
+            return self.operation.identity
+        return self.operation.inverse(self.prefix(right), self.prefix(left - 1))
+
+    def nodes(self):
+        """Materialize the snapshot's bit_array, slot 0 included"""
+        return [self._node(i) for i in range(self.size + 1)]
+
+    def to_array(self):
+        """Recover the element values at snapshot time in O(n)"""
+        return calculate_initial_array(self.nodes(), self.operation)
+
+    def release(self):
+        """Stop preserving chunks for this snapshot"""
+        self.tree._snapshots.discard(self)
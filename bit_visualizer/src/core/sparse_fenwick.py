@@ -0,0 +1,95 @@
+from bisect import bisect_left, bisect_right
+
+
+class SparseFenwickTree:
+    """Fenwick tree that stores only touched nodes, for huge index spaces"""
+
+    def __init__(self, size=None, keys=None):
+        # With keys, indices are compressed offline to their rank among the sorted keys
+        if keys is not None:
+            self.keys = sorted(set(keys))
+            size = len(self.keys)
+        else:
+            self.keys = None
+        if size is None or size < 0:
+            raise ValueError("Either a non-negative size or keys must be given")
+
+        self.size = size
+        self.nodes = {}
+        self.stats = {
+            'point_updates': 0,
+            'batch_updates': 0,
+            'batch_duplicates_merged': 0
+        }
+
+    def __len__(self):
+        return self.size
+
+    def _position(self, index):
+        """Map a user index to its 1-based tree position"""
+        if self.keys is None:
+            if not 1 <= index <= self.size:
+                raise IndexError(f"Index {index} out of range 1..{self.size}")
+            return index
+
+        position = bisect_left(self.keys, index)
+        if position == len(self.keys) or self.keys[position] != index:
+            raise KeyError(f"Index {index} was not among the compressed keys")
+        return position + 1
+
+    def _add(self, position, delta):
+        nodes = self.nodes
+        size = self.size
+        while position <= size:
+            nodes[position] = nodes.get(position, 0) + delta
+            position += position & -position
+
+    def update(self, index, delta):
+        """Add delta to the value at index"""
+        self._add(self._position(index), delta)
+        self.stats['point_updates'] += 1
+
+    def _prefix_at(self, position):
+        nodes = self.nodes
+        total = 0
+        while position > 0:
+            total += nodes.get(position, 0)
+            position -= position & -position
+        return total
+
+    def prefix(self, index):
+        """Sum of values at indices up to and including index"""
+        if self.keys is not None:
+            # Any value may be queried; it covers every key not greater than it
+            return self._prefix_at(bisect_right(self.keys, index))
+
+        if not 0 <= index <= self.size:
+            raise IndexError(f"Index {index} out of range 0..{self.size}")
+        return self._prefix_at(index)
+
+    def range_sum(self, left, right):
+        """Sum of values at indices left..right inclusive"""
+        if left > right:
+            return 0
+        if self.keys is not None:
+            return self.prefix(right) - self._prefix_at(bisect_left(self.keys, left))
+        return self.prefix(right) - self.prefix(left - 1)
+
+    def apply_updates(self, indices, deltas):
+        """Apply a batch of point updates, merging duplicate indices"""
+        indices = list(indices)
+        deltas = list(deltas)
+        if len(indices) != len(deltas):
+            raise ValueError("indices and deltas must have the same length")
+
+        merged = {}
+        for index, delta in zip(indices, deltas):
+            position = self._position(index)
+            merged[position] = merged.get(position, 0) + delta
+
+        for position, delta in merged.items():
+            self._add(position, delta)
+
+        self.stats['batch_updates'] += 1
+        self.stats['batch_duplicates_merged'] += len(indices) - len(merged)
+        return 'point'
@@ -0,0 +1,76 @@
+from math import isqrt
+
+
+class SqrtDecomposition:
+    """Block decomposition with per-block sums and pending range additions"""
+
+    def __init__(self, initial_array=(), block_size=None):
+        self.values = list(initial_array)
+        self.n = len(self.values)
+        self.block_size = block_size or max(1, isqrt(self.n))
+
+        block_count = (self.n + self.block_size - 1) // self.block_size
+        self.block_sums = [
+            sum(self.values[b * self.block_size:(b + 1) * self.block_size])
+            for b in range(block_count)
+        ]
+        # Added to every element of a block without touching values
+        self.block_adds = [0] * block_count
+
+    def __len__(self):
+        return self.n
+
+    def _check(self, left, right):
+        if not 1 <= left <= right <= self.n:
+            raise IndexError(f"Range {left}..{right} out of range 1..{self.n}")
+
+    def update(self, index, delta):
+        """Add delta to the value at 1-based index in O(1)"""
+        self._check(index, index)
+        self.values[index - 1] += delta
+        self.block_sums[(index - 1) // self.block_size] += delta
+
+    def range_add(self, left, right, delta):
+        """Add delta to every value at positions left..right inclusive in O(sqrt n)"""
+        self._check(left, right)
+        size = self.block_size
+        i, end = left - 1, right
+
+        while i < end and i % size:
+            self.values[i] += delta
+            self.block_sums[i // size] += delta
+            i += 1
+        while i + size <= end:
+            self.block_adds[i // size] += delta
+            i += size
+        while i < end:
+            self.values[i] += delta
+            self.block_sums[i // size] += delta
+            i += 1
+
+    def range_sum(self, left, right):
+        """Sum of values at positions left..right inclusive in O(sqrt n)"""
+        if left > right:
+            return 0
+        self._check(left, right)
+        size = self.block_size
+        i, end = left - 1, right
+        total = 0
+
+        while i < end and i % size:
+            total += self.values[i] + self.block_adds[i // size]
+            i += 1
+        while i + size <= end:
+            block = i // size
+            total += self.block_sums[block] + self.block_adds[block] * size
+            i += size
+        while i < end:
+            total += self.values[i] + self.block_adds[i // size]
+            i += 1
+        return total
+
+    def prefix(self, index):
+        """Sum of values at positions 1..index"""
+        if not 0 <= index <= self.n:
+            raise IndexError(f"Index {index} out of range 0..{self.n}")
+        return self.range_sum(1, index) if index else 0
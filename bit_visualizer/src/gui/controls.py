@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk
 
+from ..core.operations import OPERATIONS
+
 
 class ControlPanel:
     def __init__(self, parent, callbacks):
@@ -71,6 +73,19 @@ class ControlPanel:
         self.input_entry = ttk.Entry(input_content, style='Custom.TEntry')
         self.input_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=base_padding)
 
+        self.operation_label = ttk.Label(input_content, text="Operation:", style='Custom.TLabelframe.Label')
+        self.operation_label.pack(side=tk.LEFT, padx=base_padding)
+
+        self.operation_var = tk.StringVar(value='sum')
+        self.operation_combo = ttk.Combobox(
+            input_content,
+            textvariable=self.operation_var,
+            values=list(OPERATIONS),
+            state='readonly',
+            width=max(len(name) for name in OPERATIONS)
+        )
+        self.operation_combo.pack(side=tk.LEFT, padx=base_padding)
+
         self.init_button = ttk.Button(
             input_content,
             text="Initialize",
@@ -79,6 +94,39 @@ class ControlPanel:
         )
         self.init_button.pack(side=tk.LEFT, padx=base_padding)
 
+        self.append_button = ttk.Button(
+            input_content,
+            text="Append",
+            command=self.callbacks['append_values'],
+            style='Control.TButton'
+        )
+        self.append_button.pack(side=tk.LEFT, padx=base_padding)
+
+        # Query section
+        self.query_frame = ttk.LabelFrame(
+            self.control_panel,
+            text="Query",
+            style='Custom.TLabelframe'
+        )
+        self.query_frame.pack(side=tk.LEFT, padx=base_padding, fill=tk.BOTH)
+
+        query_content = ttk.Frame(self.query_frame)
+        query_content.pack(fill=tk.X, expand=True)
+
+        self.query_label = ttk.Label(query_content, text="Range:", style='Custom.TLabelframe.Label')
+        self.query_label.pack(side=tk.LEFT, padx=base_padding)
+
+        self.query_entry = ttk.Entry(query_content, style='Custom.TEntry', width=8)
+        self.query_entry.pack(side=tk.LEFT, padx=base_padding)
+
+        self.query_button = ttk.Button(
+            query_content,
+            text="Show",
+            command=self.callbacks['show_query'],
+            style='Control.TButton'
+        )
+        self.query_button.pack(side=tk.LEFT, padx=base_padding)
+
         # Animation Controls
         self.anim_frame = ttk.LabelFrame(
             self.control_panel,
@@ -179,6 +227,9 @@ class ControlPanel:
     def get_mode(self):
         return self.mode_var.get()
 
+    def get_operation(self):
+        return OPERATIONS[self.operation_var.get()]
+
     def get_speed(self):
         return self.speed_scale.get()
 
@@ -196,7 +247,11 @@ class ControlPanel:
                 self.load_button.config(state='disabled')
                 self.save_button.config(state='disabled')
                 self.init_button.config(state='disabled')
+                self.append_button.config(state='disabled')
                 self.input_entry.config(state='disabled')
+                self.operation_combo.config(state='disabled')
+                self.query_entry.config(state='disabled')
+                self.query_button.config(state='disabled')
                 self.scale_slider.config(state='disabled')
                 self.back_button.config(state='normal')
 
@@ -223,10 +278,14 @@ class ControlPanel:
         self.auto_radio.config(state='normal')
         self.manual_radio.config(state='normal')
         self.input_entry.config(state='normal')
+        self.operation_combo.config(state='readonly')
         self.init_button.config(state='normal')
+        self.append_button.config(state='normal' if initialized else 'disabled')
         self.load_button.config(state='normal')
         self.scale_slider.config(state='normal')
         self.save_button.config(state='normal' if initialized else 'disabled')
+        self.query_entry.config(state='normal' if initialized else 'disabled')
+        self.query_button.config(state='normal' if initialized else 'disabled')
         self.back_button.config(state='normal')
 
     def _configure_automatic_mode(self, is_running, initialized=False, animation_complete=False):
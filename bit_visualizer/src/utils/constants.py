@@ -24,6 +24,9 @@ Y_SPACING = 50
 NODE_COLOR = "lightblue"
 TEXT_COLOR = "black"
 MOVING_TEXT_COLOR = "red"
+QUERY_NODE_COLOR = "gold"
+QUERY_SUBTRACT_COLOR = "lightcoral"
+QUERY_MIRROR_COLOR = "palegreen"
 
 # Fonts
 DEFAULT_FONT = "Arial"
@@ -0,0 +1,464 @@
+import math
+import os
+import random
+from array import array
+from collections import deque
+from functools import reduce
+from multiprocessing import shared_memory
+
+import pytest
+
+from src.core import (calculate_bit_array, calculate_bit_array_parallel, XOR, MIN, MAX, PRODUCT,
+                      FenwickTree, SparseFenwickTree, MmapFenwickTree, SharedFenwickTree,
+                      ShardedFenwickTree, PersistentFenwickTree, FloatFenwickTree, MinMaxFenwickTree,
+                      SegmentTree, SqrtDecomposition, RangeFenwickTree, BlockedFenwickTree,
+                      AdaptiveEngine, PrefixSumArray, PrefixCache, LRUPrefixCache,
+                      SlidingWindowFenwick, FenwickMultiset, count_inversions,
+                      count_inversions_chunked, count_inversions_many, distinct_in_ranges,
+                      ConcurrentFenwickTree)
+
+INT64_MAX = 2 ** 63 - 1
+
+
+def random_values(rng, n, low=-50, high=50):
+    return [rng.randint(low, high) for _ in range(n)]
+
+
+def check_against(engine, reference, rng, rounds=60):
+    """Compare prefix and range_sum with a plain list after random point updates"""
+    n = len(reference)
+    for _ in range(rounds):
+        index = rng.randint(1, n)
+        delta = rng.randint(-100, 100)
+        engine.update(index, delta)
+        reference[index - 1] += delta
+
+        i = rng.randint(0, n)
+        assert engine.prefix(i) == sum(reference[:i])
+        left = rng.randint(1, n)
+        right = rng.randint(left, n)
+        assert engine.range_sum(left, right) == sum(reference[left - 1:right])
+    assert [engine.prefix(i) for i in range(n + 1)] == [sum(reference[:i]) for i in range(n + 1)]
+
+
+SUM_ENGINES = {
+    'fenwick': FenwickTree,
+    'fenwick_untyped': lambda values: FenwickTree(values, typed=False),
+    'adopted': lambda values: FenwickTree.from_buffer(bytearray(FenwickTree(values).bit_array)),
+    'blocked_1': lambda values: BlockedFenwickTree(values, block_size=1),
+    'blocked_3': lambda values: BlockedFenwickTree(values, block_size=3),
+    'blocked_16': lambda values: BlockedFenwickTree(values, block_size=16),
+    'persistent': PersistentFenwickTree,
+    'segment': SegmentTree,
+    'sqrt': SqrtDecomposition,
+    'range_fenwick': RangeFenwickTree,
+    'prefix_array': PrefixSumArray,
+    'adaptive': lambda values: AdaptiveEngine(values, window=8),
+    'prefix_cache': lambda values: PrefixCache(FenwickTree(values)),
+    'lru_cache': lambda values: LRUPrefixCache(FenwickTree(values), capacity=4),
+    'striped': lambda values: ConcurrentFenwickTree(FenwickTree(values), stripe_size=4),
+    'rwlock': lambda values: ConcurrentFenwickTree(FenwickTree(values), mode='rwlock')
+}
+
+RANGE_ADD_ENGINES = ['segment', 'sqrt', 'range_fenwick', 'prefix_array', 'adaptive']
+BATCH_ENGINES = ['fenwick', 'fenwick_untyped', 'adopted', 'blocked_3', 'prefix_cache', 'lru_cache']
+
+
+@pytest.mark.parametrize('name', sorted(SUM_ENGINES))
+@pytest.mark.parametrize('n', [1, 2, 7, 33, 100])
+def test_sum_engine_matches_list(name, n):
+    rng = random.Random(n)
+    reference = random_values(rng, n)
+    check_against(SUM_ENGINES[name](reference), list(reference), rng)
+
+
+@pytest.mark.parametrize('name', RANGE_ADD_ENGINES)
+def test_range_add_matches_list(name):
+    rng = random.Random(7)
+    reference = random_values(rng, 40)
+    engine = SUM_ENGINES[name](reference)
+    for _ in range(80):
+        left = rng.randint(1, 40)
+        right = rng.randint(left, 40)
+        delta = rng.randint(-20, 20)
+        engine.range_add(left, right, delta)
+        for i in range(left - 1, right):
+            reference[i] += delta
+        left = rng.randint(1, 40)
+        right = rng.randint(left, 40)
+        assert engine.range_sum(left, right) == sum(reference[left - 1:right])
+    assert [engine.prefix(i) for i in range(41)] == [sum(reference[:i]) for i in range(41)]
+
+
+@pytest.mark.parametrize('name', BATCH_ENGINES)
+def test_apply_updates_matches_list(name):
+    rng = random.Random(11)
+    reference = random_values(rng, 50)
+    engine = SUM_ENGINES[name](reference)
+    for _ in range(10):
+        # Repeated indices check that duplicates are merged rather than dropped
+        indices = [rng.randint(1, 50) for _ in range(30)]
+        deltas = [rng.randint(-30, 30) for _ in indices]
+        engine.apply_updates(indices, deltas)
+        for index, delta in zip(indices, deltas):
+            reference[index - 1] += delta
+        assert [engine.prefix(i) for i in range(51)] == [sum(reference[:i]) for i in range(51)]
+
+
+@pytest.mark.parametrize('name', sorted(SUM_ENGINES))
+def test_out_of_range_index_raises(name):
+    engine = SUM_ENGINES[name]([1, 2, 3])
+    with pytest.raises(IndexError):
+        engine.update(4, 1)
+    with pytest.raises(IndexError):
+        engine.prefix(4)
+
+
+def test_fenwick_operations_match_reduce():
+    rng = random.Random(3)
+    for operation in (XOR, MIN, MAX, PRODUCT):
+        low = 1 if operation is PRODUCT else 0
+        reference = random_values(rng, 30, low, 9)
+        tree = FenwickTree(reference, operation)
+        for _ in range(30):
+            index = rng.randint(1, 30)
+            # MIN and MAX only support monotone updates
+            delta = rng.randint(low, 9)
+            tree.update(index, delta)
+            reference[index - 1] = operation.combine(reference[index - 1], delta)
+            i = rng.randint(0, 30)
+            assert tree.prefix(i) == reduce(operation.combine, reference[:i], operation.identity)
+        if operation.inverse is not None:
+            assert tree.range_sum(5, 20) == reduce(operation.combine, reference[4:20],
+                                                   operation.identity)
+            assert tree.to_array() == reference
+
+
+def test_fenwick_resize_and_bulk_views():
+    rng = random.Random(5)
+    reference = random_values(rng, 20)
+    tree = FenwickTree(reference)
+    tree.extend([4, 5, 6])
+    reference += [4, 5, 6]
+    tree.shrink(5)
+    del reference[-5:]
+    tree.resize(25, fill=2)
+    reference += [2] * (25 - len(reference))
+    check_against(tree, reference, rng)
+    assert tree.to_array() == reference
+    assert tree.prefix_sums() == [sum(reference[:i]) for i in range(1, len(reference) + 1)]
+
+
+def test_fenwick_promotes_past_int64():
+    tree = FenwickTree([INT64_MAX, 0, 0])
+    assert tree.storage == 'int64'
+    tree.update(1, 1)
+    assert tree.storage == 'object'
+    assert tree.prefix(3) == INT64_MAX + 1
+    assert tree.to_array() == [INT64_MAX + 1, 0, 0]
+
+    batched = FenwickTree([INT64_MAX, 1])
+    batched.apply_updates([2, 1], [INT64_MAX, 1])
+    assert batched.to_array() == [INT64_MAX + 1, INT64_MAX + 1]
+
+
+def test_from_buffer_shares_memory():
+    nodes = array('q', calculate_bit_array([3, 1, 4, 1, 5]))
+    tree = FenwickTree.from_buffer(nodes)
+    tree.update(2, 10)
+    assert list(nodes) == calculate_bit_array([3, 11, 4, 1, 5])
+    assert tree.range_sum(2, 4) == 16
+
+
+def test_from_buffer_rejects_other_formats():
+    with pytest.raises(TypeError):
+        FenwickTree.from_buffer(array('d', [0.0, 1.0]))
+    with pytest.raises(TypeError):
+        FenwickTree.from_buffer(array('i', [0, 1, 2, 3]))
+    with pytest.raises(ValueError):
+        FenwickTree.from_buffer(bytearray(12))
+    with pytest.raises(ValueError):
+        FenwickTree.from_buffer(bytearray())
+
+
+def test_adopted_buffer_overflow_leaves_buffer_unchanged():
+    nodes = array('q', calculate_bit_array([INT64_MAX - 1, 0, 1]))
+    before = list(nodes)
+    tree = FenwickTree.from_buffer(nodes)
+    with pytest.raises(OverflowError):
+        tree.update(1, 5)
+    with pytest.raises(OverflowError):
+        tree.apply_updates([3, 1], [1, 5])
+    assert list(nodes) == before
+    assert tree.storage == 'int64'
+
+
+def test_nodes_view_needs_sum_tree():
+    with pytest.raises(TypeError):
+        FenwickTree([1, 2], XOR).nodes_view()
+
+
+def test_sparse_matches_list():
+    rng = random.Random(13)
+    tree = SparseFenwickTree(size=60)
+    check_against(tree, [0] * 60, rng)
+
+    keys = rng.sample(range(10 ** 12), 40)
+    keyed = SparseFenwickTree(keys=keys)
+    counts = dict.fromkeys(keys, 0)
+    for _ in range(80):
+        key = rng.choice(keys)
+        keyed.update(key, 1)
+        counts[key] += 1
+        bound = rng.choice(keys)
+        assert keyed.prefix(bound) == sum(c for k, c in counts.items() if k <= bound)
+    with pytest.raises(KeyError):
+        keyed.update(10 ** 12 + 1, 1)
+    with pytest.raises(IndexError):
+        tree.update(61, 1)
+
+
+def test_persistent_versions():
+    rng = random.Random(17)
+    reference = random_values(rng, 25)
+    tree = PersistentFenwickTree(reference)
+    history = [list(reference)]
+    for _ in range(30):
+        index = rng.randint(1, 25)
+        delta = rng.randint(-10, 10)
+        tree.update(index, delta)
+        reference[index - 1] += delta
+        history.append(list(reference))
+    for version, values in enumerate(history):
+        assert tree.range_sum(3, 17, version) == sum(values[2:17])
+    with pytest.raises(ValueError):
+        tree.prefix(1, len(history))
+
+
+def test_float_tree_is_close_to_fsum():
+    rng = random.Random(19)
+    reference = [rng.uniform(-1e6, 1e6) for _ in range(64)]
+    tree = FloatFenwickTree(reference)
+    for _ in range(50):
+        index = rng.randint(1, 64)
+        delta = rng.uniform(-1e3, 1e3)
+        tree.update(index, delta)
+        reference[index - 1] += delta
+        left = rng.randint(1, 64)
+        right = rng.randint(left, 64)
+        assert math.isclose(tree.range_sum(left, right), math.fsum(reference[left - 1:right]),
+                            rel_tol=1e-9, abs_tol=1e-6)
+
+
+@pytest.mark.parametrize('operation', [MIN, MAX])
+def test_minmax_query_matches_list(operation):
+    rng = random.Random(23)
+    reference = random_values(rng, 45)
+    tree = MinMaxFenwickTree(reference, operation)
+    pick = min if operation is MIN else max
+    for _ in range(100):
+        index = rng.randint(1, 45)
+        # Assignments may move a value either way
+        value = rng.randint(-50, 50)
+        tree.update(index, value)
+        reference[index - 1] = value
+        left = rng.randint(1, 45)
+        right = rng.randint(left, 45)
+        assert tree.query(left, right) == pick(reference[left - 1:right])
+
+
+def test_sliding_window_matches_deque():
+    rng = random.Random(29)
+    window = SlidingWindowFenwick(10)
+    reference = deque(maxlen=10)
+    for _ in range(60):
+        value = rng.randint(-20, 20)
+        window.push(value)
+        reference.append(value)
+        left = rng.randrange(len(reference))
+        right = rng.randrange(left, len(reference))
+        assert window.range_sum(left, right) == sum(list(reference)[left:right + 1])
+        assert window.window_sum(4) == sum(list(reference)[-4:])
+
+
+def test_multiset_matches_sorted_list():
+    rng = random.Random(31)
+    multiset = FenwickMultiset(max_key=40)
+    reference = []
+    for _ in range(150):
+        if reference and rng.random() < 0.4:
+            key = rng.choice(reference)
+            multiset.remove(key)
+            reference.remove(key)
+        else:
+            key = rng.randint(0, 40)
+            multiset.insert(key)
+            reference.append(key)
+        reference.sort()
+        if reference:
+            k = rng.randint(1, len(reference))
+            assert multiset.kth(k) == reference[k - 1]
+        key = rng.randint(0, 41)
+        assert multiset.count_less(key) == sum(1 for value in reference if value < key)
+
+
+def test_striped_xor():
+    rng = random.Random(37)
+    reference = random_values(rng, 30, 0, 255)
+    engine = ConcurrentFenwickTree(FenwickTree(reference, XOR), stripe_size=4)
+    for _ in range(40):
+        index = rng.randint(1, 30)
+        delta = rng.randint(0, 255)
+        engine.update(index, delta)
+        reference[index - 1] ^= delta
+        assert engine.range_sum(4, 25) == reduce(XOR.combine, reference[3:25], 0)
+
+
+def test_snapshots_keep_their_values():
+    rng = random.Random(41)
+    # Enough nodes to span several copy-on-write chunks
+    reference = random_values(rng, 1500)
+    tree = FenwickTree(reference)
+    snapshots = []
+    for _ in range(4):
+        snapshots.append((tree.snapshot(), list(reference)))
+        for _ in range(20):
+            index = rng.randint(1, 1500)
+            delta = rng.randint(-10, 10)
+            tree.update(index, delta)
+            reference[index - 1] += delta
+        tree.apply_updates([1, 1500], [3, -3])
+        reference[0] += 3
+        reference[-1] -= 3
+    for snapshot, values in snapshots:
+        assert snapshot.to_array() == values
+        assert snapshot.range_sum(100, 1400) == sum(values[99:1400])
+        snapshot.release()
+    assert tree.to_array() == reference
+
+
+def test_mmap_matches_list(tmp_path):
+    rng = random.Random(43)
+    reference = random_values(rng, 70)
+    path = str(tmp_path / 'tree.bit')
+    with MmapFenwickTree.create(path, reference) as tree:
+        check_against(tree, list(reference), rng)
+        tree.flush()
+    with MmapFenwickTree(path, readonly=True) as tree:
+        assert tree.prefix(70) == tree.prefix(35) + tree.range_sum(36, 70)
+
+
+def test_mmap_overflow_leaves_file_unchanged(tmp_path):
+    path = str(tmp_path / 'tree.bit')
+    with MmapFenwickTree.create(path, [INT64_MAX - 1, 0, 0, 0]) as tree:
+        before = list(tree.bit_array)
+        with pytest.raises(OverflowError):
+            tree.update(1, 5)
+        # Node 1 would fit but node 2 and 4 would not; nothing on the path may change
+        assert list(tree.bit_array) == before
+
+
+def test_mmap_create_failure_removes_file(tmp_path):
+    path = str(tmp_path / 'tree.bit')
+    # Node 2 of a half-built file would pass int64
+    with pytest.raises(ValueError):
+        MmapFenwickTree.create(path, [INT64_MAX, 1])
+    assert not os.path.exists(path)
+
+
+def test_shared_matches_list():
+    rng = random.Random(47)
+    reference = random_values(rng, 50)
+    with SharedFenwickTree.create(reference) as writer:
+        check_against(writer, reference, rng)
+        with SharedFenwickTree.attach(writer.name) as reader:
+            assert [reader.prefix(i) for i in range(51)] == [sum(reference[:i]) for i in range(51)]
+
+
+def test_shared_overflow_leaves_nodes_unchanged():
+    with SharedFenwickTree.create([INT64_MAX - 1, 0, 0, 0]) as writer:
+        with pytest.raises(OverflowError):
+            writer.update(1, 5)
+        assert writer.version % 2 == 0
+        assert [writer.prefix(i) for i in range(5)] == [0] + [INT64_MAX - 1] * 4
+
+
+def test_shared_create_failure_unlinks_segment():
+    name = f'bit_test_{os.getpid()}'
+    with pytest.raises(ValueError):
+        SharedFenwickTree.create([INT64_MAX, 1], name=name)
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_sharded_matches_list():
+    rng = random.Random(53)
+    reference = random_values(rng, 40)
+    with ShardedFenwickTree(reference, workers=3, batch_capacity=8) as tree:
+        check_against(tree, reference, rng, rounds=20)
+        indices = [rng.randint(1, 40) for _ in range(20)]
+        deltas = [rng.randint(-9, 9) for _ in indices]
+        tree.apply_updates(indices, deltas)
+        for index, delta in zip(indices, deltas):
+            reference[index - 1] += delta
+        assert tree.prefix_many(range(41)) == [sum(reference[:i]) for i in range(41)]
+
+
+def test_sharded_overflow_paths():
+    with ShardedFenwickTree([INT64_MAX - 1, 0, 5, 6], workers=2) as tree:
+        with pytest.raises(OverflowError):
+            tree.apply_updates([3, 1], [1, 2 ** 63])
+        # The out-of-range delta was rejected before any shard changed
+        assert tree.prefix_many(range(5)) == [0, INT64_MAX - 1, INT64_MAX - 1,
+                                              INT64_MAX + 4, INT64_MAX + 10]
+        tree.update(2, 5)
+        with pytest.raises(OverflowError):
+            tree.prefix(2)
+        # Workers survive a failed query, and prefixes spanning shards add up past int64
+        assert tree.prefix(4) == INT64_MAX + 15
+
+
+def test_parallel_build_matches_serial():
+    rng = random.Random(59)
+    for n in (0, 1, 5, 64, 1000):
+        values = random_values(rng, n)
+        assert list(calculate_bit_array_parallel(values, workers=2)) == calculate_bit_array(values)
+    values = random_values(rng, 100)
+    assert list(calculate_bit_array_parallel(values, workers=2, block_size=8)) == \
+        calculate_bit_array(values)
+    with pytest.raises(ValueError):
+        calculate_bit_array_parallel(values, block_size=6)
+
+
+def test_parallel_build_falls_back_past_int64():
+    values = [INT64_MAX, INT64_MAX, 1]
+    assert calculate_bit_array_parallel(values) == calculate_bit_array(values)
+
+
+def naive_inversions(values):
+    return sum(1 for i in range(len(values)) for j in range(i + 1, len(values))
+               if values[i] > values[j])
+
+
+def test_inversions_match_brute_force():
+    rng = random.Random(61)
+    arrays = [random_values(rng, n, -5, 5) for n in (0, 1, 2, 30, 80)]
+    for values in arrays:
+        expected = naive_inversions(values)
+        assert count_inversions(values) == expected
+        chunks = [values[i:i + 7] for i in range(0, len(values), 7)]
+        assert count_inversions_chunked(lambda: iter(chunks)) == expected
+    assert count_inversions_many(arrays, processes=2) == list(map(naive_inversions, arrays))
+
+
+def test_distinct_in_ranges_matches_sets():
+    rng = random.Random(67)
+    values = random_values(rng, 60, 0, 9)
+    queries = []
+    for _ in range(50):
+        left = rng.randint(1, 60)
+        queries.append((left, rng.randint(left, 60)))
+    assert distinct_in_ranges(values, queries) == \
+        [len(set(values[left - 1:right])) for left, right in queries]
+    with pytest.raises(IndexError):
+        distinct_in_ranges(values, [(0, 3)])